@@ -1,4 +1,6 @@
+import multiprocessing
 from src.libraries.password_manager import PasswordManager
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     PasswordManager().run()
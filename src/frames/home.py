@@ -1,8 +1,15 @@
+import math
+import os
 import pyperclip
 import customtkinter
 from sqlite3 import Row
 from src.utils import helpers
 from src.libraries.auth import Auth
+from src.libraries.decryptor import Decryptor
+from src.libraries.export import Export
+from src.libraries.importer import Importer, ImportResult, InvalidImportFile
+from src.libraries.jobs import Job
+from src.libraries.search import IncrementalSearch
 from src.models.models import Password
 from src.frames.frame_base import FrameBase
 from src.mixins.validator_mixin import InputField
@@ -12,8 +19,13 @@ from src.utils import window
 
 class Home(FrameBase):
     """"Home" window."""
+    SEARCH_DELAY: int = 150  # Milliseconds of typing inactivity before the search runs
+
     def __init__(self, root: PasswordManager, **kwargs):
         super().__init__(root, **kwargs)
+        self.__search_job: str | None = None
+        self.__export_job: Job | None = None
+        self.__importing: bool = False  # Entries created during the import would be listed twice after it
 
         # Images
         self.key_icon = customtkinter.CTkImage(light_image=self.root.images.key)
@@ -156,6 +168,22 @@ class Home(FrameBase):
         )
         self.generate_btn.place(x=10, y=310)
 
+        # Import button
+        self.import_btn = customtkinter.CTkButton(
+            self.form_frame,
+            width=330,
+            height=40,
+            text="Import",
+            text_color=self.root.color_mode.primary,
+            image=customtkinter.CTkImage(light_image=self.root.images.document),
+            compound="right",
+            fg_color=self.root.colors.primary,
+            hover_color=helpers.adjust_brightness(self.root.colors.primary),
+            font=self.root.helvetica(15),
+            command=self.__import
+        )
+        self.import_btn.place(x=10, y=420)
+
         # Add button
         self.add_btn = customtkinter.CTkButton(
             self.form_frame,
@@ -266,21 +294,30 @@ class Home(FrameBase):
         )
         self.col_username_label.grid(row=0, column=2, padx=5, pady=8)
 
-        # Pdf button
-        self.pdf_btn = customtkinter.CTkButton(
+        # Export button
+        self.export_btn = customtkinter.CTkButton(
             self,
             width=115,
             height=50,
-            text="PDF",
+            text="Export",
             text_color=self.root.color_mode.primary,
             fg_color=self.root.colors.primary,
             hover_color=helpers.adjust_brightness(self.root.colors.primary),
             font=self.root.helvetica(17),
             image=customtkinter.CTkImage(light_image=self.root.images.document),
             compound="right",
-            command=self.__save_to_pdf
+            command=self.__export
+        )
+        self.export_btn.place(x=400, y=625)
+
+        # Progress bar, shown while passwords are being exported or imported
+        self.progress_bar = customtkinter.CTkProgressBar(
+            self,
+            width=572,
+            height=8,
+            progress_color=self.root.colors.primary,
+            fg_color=self.root.colors.secondary
         )
-        self.pdf_btn.place(x=400, y=625)
 
         # User password/passcode input
         self.pass_input = customtkinter.CTkEntry(
@@ -328,19 +365,20 @@ class Home(FrameBase):
             self.lock_btn.configure(text="Unlock", image=self.unlock_icon)
 
     def __search_passwords(self, _event=None):
+        """Schedules search in user's passwords, postponing it while the user keeps typing."""
+        if self.__search_job:
+            self.after_cancel(self.__search_job)
+
+        self.__search_job = self.after(self.SEARCH_DELAY, self.__run_search)
+
+    def __run_search(self):
         """Performs search in user's passwords. Shows results in the table."""
+        self.__search_job = None
         search_param = self.search_input.get()
 
         if search_param != "":
-            self.passwords.hide_table()
-            self.passwords.destroy_search_table()
-            self.passwords.search = Password.search(
-                item=search_param,
-                search_in=["account"],
-                additional_condition="user_id = :user_id",
-                named_params={"user_id": Auth.user.id}
-            )
-            self.passwords.show(self.passwords.search_table)
+            self.passwords.search = self.passwords.searcher.search(search_param)
+            self.passwords.show(self.passwords.search)
         else:
             self.__render_content()
 
@@ -366,8 +404,7 @@ class Home(FrameBase):
                 self.root.flash_message("Wrong password", "danger")
 
         def check_both():
-            if (helpers.verify_password(password, user_input) or
-                    helpers.verify_password(passcode, user_input)):
+            if Auth.verify_any([password, passcode], user_input):
                 unlock()
             else:
                 Auth.user.decrease_attempts()
@@ -396,9 +433,10 @@ class Home(FrameBase):
             self.__cancel_form_edit()
             self.clear_entries(self.search_input)
             self.search_input.configure(state=customtkinter.DISABLED)
-            self.passwords.destroy_search_table()
-            self.__render_content()
+            # Locked table is rendered without caching decrypted fields
             self.__toggle_passwords_table()
+            self.passwords.decryptor.clear()
+            self.__render_content()
             self.root.flash_message("Passwords locked.", "success")
 
         if not self.passwords.is_locked:
@@ -419,8 +457,12 @@ class Home(FrameBase):
         else:
             self.__lock_passwords_table()
 
-    def __save_to_pdf(self):
-        """Generates pdf file with user's passwords table."""
+    def __export(self):
+        """Exports user's passwords or cancels the running export."""
+        if self.__export_job:
+            self.__export_job.cancel()
+            return
+
         result = self.validate({
             "password": InputField(self.pass_input.get(), "required")
         })
@@ -432,7 +474,7 @@ class Home(FrameBase):
                 self.pass_input.configure(border_color=self.root.colors.primary)
                 self.pass_input.delete(0, customtkinter.END)
                 self.root.focus()
-                self.__generate_pdf(result.passed["password"])
+                self.__export_file(result.passed["password"])
             else:
                 self.root.flash_message("Wrong password.", "danger")
         else:
@@ -447,11 +489,11 @@ class Home(FrameBase):
     def __render_content(self):
         """Shows user's passwords table."""
         if self.passwords.user:
-            self.enable_buttons(self.pdf_btn, self.lock_btn)
-            self.passwords.destroy_search_table()
-            self.passwords.show(self.passwords.table)
+            self.enable_buttons(self.export_btn, self.lock_btn)
         else:
-            self.disable_buttons(self.pdf_btn, self.lock_btn)
+            self.disable_buttons(self.export_btn, self.lock_btn)
+
+        self.passwords.show(self.passwords.user)
 
     @staticmethod
     def __get_user_passwords() -> list:
@@ -468,8 +510,8 @@ class Home(FrameBase):
         self.__clear_form()
         self.passwords.selected_id = entry["id"]
         self.web_app_name_input.insert(0, entry["account"])
-        self.username_input.insert(0, helpers.decrypt_data(entry["username"], Auth.user.key))
-        self.password_input.insert(0, helpers.decrypt_data(entry["password"], Auth.user.key))
+        self.username_input.insert(0, self.passwords.decryptor.get(entry, "username"))
+        self.password_input.insert(0, self.passwords.decryptor.get(entry, "password"))
 
         if not self.edit_mode:
             self.__toggle_add_btn(self.add_btn)
@@ -502,6 +544,10 @@ class Home(FrameBase):
 
     def __submit_password(self):
         """Creates entry in database and user's passwords list. Refreshes "Home" window on success."""
+        if self.__importing:
+            self.root.flash_message("Wait until the import is finished.", "danger")
+            return
+
         result = self.validate({
             "web/app": InputField(self.web_app_name_input.get(), "required"),
             "username": InputField(self.username_input.get(), "required"),
@@ -510,19 +556,20 @@ class Home(FrameBase):
 
         if not result.errors:
             entry = result.passed
-            username = helpers.encrypt_data(entry["username"], (Auth.user.key, Auth.user.salt))
-            password = helpers.encrypt_data(entry["password"], (Auth.user.key, Auth.user.salt))
-            Password.create(
+            username = helpers.encrypt_data(entry["username"], Auth.user.key)
+            password = helpers.encrypt_data(entry["password"], Auth.user.key)
+            created, = Password.create_returning(
                 ("user_id", "account", "username", "password"),
                 (Auth.user.id, entry["web/app"], username, password)
             )
-            self.passwords.add(Password.find_latest())
+
+            self.passwords.add(created)
             self.__refresh_window()
 
             if self.lock_btn.cget("text") == "Unlock":
                 self.__lock_passwords_table()
 
-            self.enable_buttons(self.pdf_btn)
+            self.enable_buttons(self.export_btn)
             self.__clear_form()
             self.root.flash_message("Entry stored successfully.", "success")
         else:
@@ -530,6 +577,10 @@ class Home(FrameBase):
 
     def __update_password(self):
         """Updates entry in database and user's passwords list. Refreshes "Home" window on success."""
+        if self.__importing:
+            self.root.flash_message("Wait until the import is finished.", "danger")
+            return
+
         result = self.validate({
             "web/app": InputField(self.web_app_name_input.get(), "required"),
             "username": InputField(self.username_input.get(), "required"),
@@ -544,8 +595,8 @@ class Home(FrameBase):
                     self.passwords.selected_id,
                     {
                         "account": entry["web/app"],
-                        "username": helpers.encrypt_data(entry["username"], (Auth.user.key, Auth.user.salt)),
-                        "password": helpers.encrypt_data(entry["password"], (Auth.user.key, Auth.user.salt))
+                        "username": helpers.encrypt_data(entry["username"], Auth.user.key),
+                        "password": helpers.encrypt_data(entry["password"], Auth.user.key)
                     }
                 )
                 self.passwords.update(Password.find_by_id(self.passwords.selected_id))
@@ -556,13 +607,17 @@ class Home(FrameBase):
 
     def __delete_password(self):
         """Deletes entry from database and user's passwords list. Refreshes "Home" window on success."""
+        if self.__importing:
+            self.root.flash_message("Wait until the import is finished.", "danger")
+            return
+
         if self.show_modal("Delete entry?", 300, 130, ("Yes", True), ("No", False)):
             Password.delete(self.passwords.selected_id)
             self.passwords.delete(self.passwords.selected_id)
             self.__refresh_window()
 
             if not self.passwords.user:
-                self.disable_buttons(self.pdf_btn)
+                self.disable_buttons(self.export_btn)
 
             self.root.flash_message("Entry deleted successfully", "success")
 
@@ -576,25 +631,101 @@ class Home(FrameBase):
         self.root.flash_message("Copied to clipboard\nClipboard clears in 30 seconds", "success")
         self.root.after(self.root.LOCK_TIMERS["30 sec"], clear_clipboard)
 
-    def __generate_pdf(self, password: str):
-        """Generates and saves pdf file with user's passwords table."""
-        path = self.root.save_file_dialog()
+    def __export_file(self, password: str):
+        """
+        Exports user's passwords in the background, as pdf table or encrypted CSV/JSON Lines file.
+        :param password: Password protecting the file.
+        """
+        chosen = self.root.save_file_dialog(Export.file_types())
+
+        if chosen:
+            try:
+                path, export_format = Export.target(*chosen)
+            except ValueError as error:
+                self.root.flash_message(str(error), "danger")
+                return
+
+            name = os.path.basename(path)
+            self.export_btn.configure(text="Cancel")
+            self.progress_bar.set(0)
+            self.progress_bar.place(x=400, y=607)
+            self.__export_job = self.root.jobs.submit(
+                Export.to_file, path, list(self.passwords.user), Auth.user.key, Auth.user.email, password,
+                export_format,
+                progress=True,
+                on_progress=lambda value, _message: self.progress_bar.set(value),
+                on_success=lambda count: self.__finish_export(f"Exported {count} entries to {name}.", "success"),
+                on_cancel=lambda: self.__finish_export("Export cancelled.", "success"),
+                on_error=lambda _error: self.__finish_export(f"{name} could not be saved.", "danger")
+            )
+
+    def __finish_export(self, message: str, category: str):
+        """
+        Hides export's progress and notifies about its outcome.
+        :param message: Flash message.
+        :param category: Flash message's category - "success" or "danger".
+        """
+        self.__export_job = None
+        self.progress_bar.place_forget()
+        self.export_btn.configure(text="Export")
+        self.root.flash_message(message, category)
+
+    def __import(self):
+        """Imports passwords from CSV file of a browser or password manager in the background."""
+        path = self.root.open_file_dialog()
 
         if path:
-            data_content = []
+            last_id = self.passwords.user[0]["id"] if self.passwords.user else 0
+            self.__importing = True
+            self.disable_buttons(self.import_btn, self.export_btn)
+            self.progress_bar.set(0)
+            self.progress_bar.place(x=400, y=607)
+            self.root.jobs.submit(
+                Importer.csv, path, Auth.user.id, Auth.user.key,
+                progress=True,
+                on_progress=lambda value, _message: self.progress_bar.set(value),
+                on_success=lambda result: self.__finish_import(last_id, self.__import_message(result)),
+                on_error=lambda error: self.__finish_import(
+                    last_id,
+                    str(error) if isinstance(error, InvalidImportFile) else "File could not be imported.",
+                    "danger"
+                )
+            )
+
+    @staticmethod
+    def __import_message(result: ImportResult) -> str:
+        """Describes outcome of the finished import."""
+        message = f"Imported {result.imported} entries."
+
+        if result.skipped:
+            message += f" Skipped {result.skipped} rows without Web/App, username or password."
+
+        return message
+
+    def __finish_import(self, last_id: int, message: str, category: str = "success"):
+        """
+        Shows imported passwords and notifies about import's outcome.
+        Batches stored before a failed import are shown as well.
+        :param last_id: Id of the newest entry before the import.
+        :param message: Flash message.
+        :param category: Flash message's category - "success" or "danger".
+        """
+        self.__importing = False
+        self.progress_bar.place_forget()
+        self.enable_buttons(self.import_btn)
+        imported = Password.find_by("user_id = ? AND id > ?", [Auth.user.id, last_id], order_by="id", order="DESC")
+
+        if imported:
+            self.passwords.extend(imported)
+            self.__refresh_window()
 
-            for i, entry in enumerate(self.passwords.user):
-                data_content.append(list(entry[2:]))
-                data_content[i][1] = helpers.decrypt_data(data_content[i][1], Auth.user.key)
-                data_content[i][2] = helpers.decrypt_data(data_content[i][2], Auth.user.key)
+            if self.lock_btn.cget("text") == "Unlock":
+                self.__lock_passwords_table()
 
-            data = data_content.copy()
-            data.insert(0, ["Web/App", "Username", "Password"])
+        if self.passwords.user:
+            self.enable_buttons(self.export_btn)
 
-            helpers.generate_pdf(
-                path, data, Auth.user.email, password
-            )
-            self.root.flash_message("Document saved successfully.", "success")
+        self.root.flash_message(message, category)
 
     def __toggle_add_btn(self, add_btn_widget):
         """Toggles `Add/Cancel` button's appearance."""
@@ -611,48 +742,114 @@ class Home(FrameBase):
 
 
 class Passwords:
-    """Passwords management class for "Home" window."""
+    """
+    Passwords management class for "Home" window.
+    Table is virtualized: only a pool of rows sized to the viewport is created and the rows
+    are rebound to the entries as the table's frame scrolls.
+    Entries' fields are decrypted when their row is first rendered or clicked.
+    """
+    ROW_HEIGHT: int = 56  # 40px button + 8px padding above and below
+    HEADER_HEIGHT: int = 44  # 28px label + 8px padding above and below
+    WARM_ON_IDLE: bool = True  # Decrypt the next page of usernames while Tk is idle
+    WARM_BATCH: int = 4  # Number of usernames decrypted per idle callback
+
     def __init__(self, master: Home, user_passwords: list):
         self.master: Home = master
         self.is_locked: bool = True
-        self.is_hidden: bool = False
         self.user: list[Row] = user_passwords
-        self.__search: list[Row] = []
-        self.table: list[dict[str, customtkinter.CTkButton]] = self.__create_rows(self.user)
-        self.search_table: list[dict[str, customtkinter.CTkButton]] = []
+        self.search: list[Row] = []
+        self.data: list[Row] = self.user
         self.selected_id = None
+        self.decryptor: Decryptor = Auth.user.decryptor
+        self.searcher: IncrementalSearch = IncrementalSearch(self.user, "account")
+        self.__warm_job: str | None = None
+
+        self.frame: customtkinter.CTkScrollableFrame = master.passwords_table_frame
+        self.canvas = self.frame._parent_canvas
+        self.row_height: int = self.frame._apply_widget_scaling(self.ROW_HEIGHT)
+        self.header_height: int = self.frame._apply_widget_scaling(self.HEADER_HEIGHT)
+
+        self.table: list[dict[str, customtkinter.CTkButton]] = self.__create_rows(self.__pool_size())
+        self.__bound: list[Row | None] = [None for _ in self.table]
+        self.__setup_scrolling()
+
+    def __pool_size(self) -> int:
+        """Number of rows needed to fill the viewport, plus one partially visible row."""
+        viewport_height = self.frame._apply_widget_scaling(self.frame.cget("height"))
+        return math.ceil(viewport_height / self.row_height) + 1
+
+    def __setup_scrolling(self):
+        """Takes over the scroll region of the table's frame, which holds only the rows pool."""
+        self.frame.unbind("<Configure>")
+        self.canvas.configure(yscrollcommand=self.__on_scroll)
+        self.__update_scroll_region()
+
+    def __update_scroll_region(self):
+        """Sizes the scroll region to fit all rows of the displayed data."""
+        height = self.header_height + len(self.data) * self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self.frame.winfo_reqwidth(), height))
+
+    def __on_scroll(self, first: str, last: str):
+        """Updates the scrollbar and rebinds the rows pool to the entries in view."""
+        self.frame._scrollbar.set(first, last)
+        self.__render()
+
+    def __render(self):
+        """Moves the rows pool to the top of the viewport and binds it to the entries in view."""
+        top = self.canvas.canvasy(0)
+        first = max(0, int((top - self.header_height) // self.row_height))
+        self.canvas.coords(self.frame._create_window_id, 0, first * self.row_height)
+
+        for position, row in enumerate(self.table):
+            index = first + position
+
+            if index < len(self.data):
+                entry = self.data[index]
+
+                if self.__bound[position] is not entry:
+                    self.__bind_row(row, entry)
+                    self.__bound[position] = entry
+                    self.show_row(position, row)
+            elif self.__bound[position] is not None:
+                self.__bound[position] = None
+                self.hide_row(row)
+
+        if self.WARM_ON_IDLE and not self.is_locked:
+            self.__schedule_warm(first + len(self.table))
+
+    def __schedule_warm(self, start: int):
+        """Schedules decryption of the page following the viewport for when Tk is idle."""
+        if self.__warm_job:
+            self.master.after_cancel(self.__warm_job)
+
+        pending = [
+            entry for entry in self.data[start:start + len(self.table)]
+            if not self.decryptor.is_decrypted(entry, "username")
+        ]
+        self.__warm_job = self.master.after_idle(self.__warm, pending) if pending else None
+
+    def __warm(self, pending: list[Row]):
+        """Decrypts a batch of pending usernames and reschedules itself for the rest."""
+        self.decryptor.warm(pending[:self.WARM_BATCH], "username")
+        pending = pending[self.WARM_BATCH:]
+        self.__warm_job = self.master.after_idle(self.__warm, pending) if pending else None
+
+    def show(self, data: list[Row]):
+        """Displays `data` in the passwords table, scrolled to the top."""
+        self.data = data
+        self.__update_scroll_region()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def refresh(self):
+        """Rebinds the rows pool to the displayed data."""
+        self.__bound = [None for _ in self.table]
 
-    @property
-    def search(self):
-        return self.__search
-
-    @search.setter
-    def search(self, value):
-        self.__search = value
-        self.search_table = self.__create_rows(self.__search)
-
-    def show(self, table):
-        """Displays the passwords table content."""
-        if table is self.table:
-            self.is_hidden = False
-
-        for index, row in enumerate(table):
-            self.show_row(index, row)
-
-    def destroy_search_table(self):
-        """Destroys all widgets from search results table."""
-        for row in self.search_table:
-            for widget in row.values():
-                widget.destroy()
-
-    def hide_table(self):
-        """Hides table with all user's passwords."""
-        if not self.is_hidden:
-            for row in self.table:
-                for widget in row.values():
-                    widget.grid_forget()
+        for row in self.table:
+            self.hide_row(row)
 
-            self.is_hidden = True
+        self.__update_scroll_region()
+        self.__render()
 
     @staticmethod
     def show_row(index, row):
@@ -664,10 +861,20 @@ class Passwords:
         row["username_btn"].grid(row=index, column=2, padx=5, pady=8)
         row["username_btn"].grid_propagate(False)
 
+    @staticmethod
+    def hide_row(row):
+        """Hides row."""
+        for widget in row.values():
+            widget.grid_forget()
+
     def lock(self):
-        """Sets widgets state to "disabled" in the passwords table."""
+        """Sets widgets state to "disabled" in the passwords table and stops decrypting usernames in advance."""
         self.is_locked = True
 
+        if self.__warm_job:
+            self.master.after_cancel(self.__warm_job)
+            self.__warm_job = None
+
         for row in self.table:
             row["password_btn"].configure(image=self.master.key_icon_disabled)
 
@@ -684,35 +891,28 @@ class Passwords:
             for widget in row.values():
                 widget.configure(state=customtkinter.NORMAL)
 
-    def __create_rows(self, data: list):
-        """Creates list of table rows."""
-        rows = []
+    def __create_rows(self, count: int):
+        """Creates the pool of table rows."""
+        return [self.__create_row() for _ in range(count)]
 
-        for entry in data:
-            rows.append(self.__create_row(entry))
-
-        return rows
-
-    def __create_row(self, entry):
-        """Creates table's row."""
+    def __create_row(self):
+        """Creates table's row, not bound to any entry."""
         image = self.master.key_icon_disabled if self.is_locked else self.master.key_icon
         state = customtkinter.DISABLED if self.is_locked else customtkinter.NORMAL
-        username = helpers.decrypt_data(entry["username"], Auth.user.key)
         return {
             "account_btn": customtkinter.CTkButton(
-                self.master.passwords_table_frame,
+                self.frame,
                 height=40,
                 width=240,
                 font=self.master.root.helvetica(14),
                 fg_color=self.master.root.colors.secondary,
                 text_color=self.master.root.colors.primary,
                 hover_color=helpers.adjust_brightness(self.master.root.colors.secondary),
-                text=entry["account"],
-                command=lambda e=entry: self.master.transfer_to_form(e),
+                text="",
                 state=state
             ),
             "password_btn": customtkinter.CTkButton(
-                self.master.passwords_table_frame,
+                self.frame,
                 height=40,
                 width=60,
                 font=self.master.root.helvetica(14),
@@ -721,51 +921,65 @@ class Passwords:
                 hover_color=helpers.adjust_brightness(self.master.root.colors.secondary),
                 image=image,
                 text="",
-                command=lambda e=entry: self.master.copy_to_clipboard(
-                    helpers.decrypt_data(e["password"], Auth.user.key)),
                 state=state
             ),
             "username_btn": customtkinter.CTkButton(
-                self.master.passwords_table_frame,
+                self.frame,
                 height=40,
                 width=220,
                 font=self.master.root.helvetica(14),
                 fg_color=self.master.root.colors.secondary,
                 text_color=self.master.root.colors.primary,
                 hover_color=helpers.adjust_brightness(self.master.root.colors.secondary),
-                text=username,
-                command=lambda e=entry: self.master.copy_to_clipboard(username),
+                text="",
                 state=state
             )
         }
 
+    def __bind_row(self, row: dict, entry: Row):
+        """Binds table's row to the entry."""
+        username = self.decryptor.get(entry, "username", cache=not self.is_locked)
+        row["account_btn"].configure(
+            text=entry["account"],
+            command=lambda e=entry: self.master.transfer_to_form(e)
+        )
+        row["password_btn"].configure(
+            command=lambda e=entry: self.master.copy_to_clipboard(self.decryptor.get(e, "password"))
+        )
+        row["username_btn"].configure(
+            text=username,
+            command=lambda: self.master.copy_to_clipboard(username)
+        )
+
     def add(self, entry):
-        """Adds entry to the user's passwords list and table's row."""
+        """Adds entry to the user's passwords list and refreshes the table."""
         self.user.insert(0, entry)
-        self.table.insert(0, self.__create_row(entry))
+        self.searcher.reset()
+        self.refresh()
+
+    def extend(self, entries: list[Row]):
+        """Adds entries, newest first, to the user's passwords list. Table is refreshed by the caller."""
+        self.user[:0] = entries
+        self.searcher.reset()
 
     def update(self, entry):
-        """Updates entry in the user's passwords list and table's row."""
+        """Updates entry in the user's passwords list and refreshes the table."""
         index = self.__find_by_id(entry["id"])
         self.user[index] = entry
-        self.__destroy_row(self.table, index)
-        self.table[index] = self.__create_row(entry)
+        self.searcher.reset()
+        self.decryptor.forget(entry["id"])
+        self.refresh()
 
     def delete(self, __id):
-        """Deletes entry from the user's passwords list and table's row."""
+        """Deletes entry from the user's passwords list and refreshes the table."""
         index = self.__find_by_id(__id)
         del self.user[index]
-        self.__destroy_row(self.table, index)
-        del self.table[index]
+        self.searcher.reset()
+        self.decryptor.forget(__id)
+        self.refresh()
 
     def __find_by_id(self, __id):
         """Gets index of Row object in the user's passwords list where ids matches."""
         for index, entry in enumerate(self.user):
             if entry["id"] == __id:
                 return index
-
-    @staticmethod
-    def __destroy_row(table: list, index: int):
-        """Destroy all widgets in the table's row."""
-        for column in table[index].values():
-            column.destroy()
@@ -1,6 +1,6 @@
 import customtkinter
 from src.utils import helpers
-from src.libraries.auth import Credentials, Auth
+from src.libraries.auth import Credentials, Auth, User
 from src.frames.frame_base import FrameBase
 from src.libraries.password_manager import PasswordManager
 from src.mixins.validator_mixin import InputField
@@ -12,6 +12,7 @@ class LogIn(FrameBase):
     """"Log in" window."""
     def __init__(self, root: PasswordManager, **kwargs):
         super().__init__(root, **kwargs)
+        self.__logging_in = False
         self.__initialize_gui()
 
     def __initialize_gui(self):
@@ -153,6 +154,16 @@ class LogIn(FrameBase):
             lambda event: self.toggle_password_visibility(self.key_input)
         )
 
+        # Progress bar shown while credentials are being verified
+        self.progress_bar = customtkinter.CTkProgressBar(
+            self.form_frame,
+            mode="indeterminate",
+            width=350,
+            height=6,
+            progress_color=self.root.THEME_COLORS[style.TURQUOISE].primary,
+            fg_color=self.root.THEME_COLORS[style.TURQUOISE].secondary
+        )
+
         # Login button
         self.login_btn = customtkinter.CTkButton(
             self.form_frame,
@@ -184,7 +195,10 @@ class LogIn(FrameBase):
         self.sign_up_btn.place(x=50, y=520)
 
     def __log_in(self, _event=None):
-        """Logs in user."""
+        """Verifies credentials in the background and logs in user."""
+        if self.__logging_in:
+            return
+
         result = self.validate({
             "email": InputField(self.email_input.get(), "required"),
             "password": InputField(self.password_input.get(), "required"),
@@ -193,9 +207,43 @@ class LogIn(FrameBase):
 
         if not result.errors:
             user = result.passed
-            if Auth.log_in(Credentials(user["email"], user["password"], user["key"])):
-                self.successful_log_in()
-            else:
-                self.root.flash_message("Wrong credentials.", "danger")
+            self.__set_busy(True)
+            self.root.jobs.submit(
+                Auth.authenticate,
+                Credentials(user["email"], user["password"], user["key"]),
+                on_success=self.__finish_log_in,
+                on_error=self.__log_in_error
+            )
         else:
             self.root.flash_message(next(iter(result.errors.values())), "danger")
+
+    def __finish_log_in(self, user: User | None):
+        """Logs in authenticated user or notifies about wrong credentials."""
+        self.__set_busy(False)
+
+        if user:
+            Auth.user = user
+            self.successful_log_in()
+        else:
+            self.root.flash_message("Wrong credentials.", "danger")
+
+    def __log_in_error(self, error: Exception):
+        """Restores the form when verifying credentials failed."""
+        self.__set_busy(False)
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def __set_busy(self, busy: bool):
+        """
+        Shows or hides the busy indicator and blocks the form while credentials are being verified.
+        :param busy: True when verification starts, False when it ends.
+        """
+        self.__logging_in = busy
+
+        if busy:
+            self.login_btn.configure(text="Logging in...", state=customtkinter.DISABLED)
+            self.progress_bar.place(x=50, y=440)
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.place_forget()
+            self.login_btn.configure(text="Login", state=customtkinter.NORMAL)
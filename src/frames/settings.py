@@ -1,6 +1,7 @@
 import customtkinter
-from src.utils.helpers import adjust_brightness, get_key_by_value, verify_password, hash_password
+from src.utils.helpers import adjust_brightness, get_key_by_value, verify_password
 from src.libraries.auth import Auth
+from src.libraries.key_policy import KeyPolicy
 from src.frames.frame_base import FrameBase
 from src.models.models import User
 from src.libraries.password_manager import PasswordManager
@@ -590,30 +591,58 @@ class Settings(FrameBase):
         })
 
         if not results.errors:
-            if verify_password(Auth.user.password, current_password):
-                cleaned_data = self.__prepare_data(results.passed)
-
-                if cleaned_data:
-                    User.update(Auth.user.id, cleaned_data)
-                    Auth.user.update()
-                    self.root.refresh_windows(window.HOME, window.SETTINGS)
-                    self.root.show(window.SETTINGS)
-                    self.root.flash_message("User details updated successfully.", "success")
-            else:
-                self.root.flash_message("Wrong password", "danger")
+            lock_timer = self.root.LOCK_TIMERS[self.lock_timer_option_menu.get()]
+            self.disable_buttons(self.save_btn)
+            self.root.jobs.submit(
+                self.__prepare_data,
+                results.passed,
+                lock_timer if lock_timer != Auth.user.lock_timer else None,
+                Auth.user.password,
+                Auth.user.email,
+                on_success=self.__save_details,
+                on_error=self.__details_error
+            )
         else:
             self.root.flash_message(next(iter(results.errors.values())), "danger")
 
-    def __prepare_data(self, data):
-        """Prepares details data to be updated."""
-        new_password = hash_password(data["new_password"]) if data["new_password"] else None
-        passcode = hash_password(data["passcode"]) if data["passcode"] else None
+    def __save_details(self, cleaned_data: dict | None):
+        """Saves prepared details. Called on the main loop when details are prepared."""
+        self.enable_buttons(self.save_btn)
+
+        if cleaned_data is None:
+            self.root.flash_message("Wrong password", "danger")
+        elif cleaned_data:
+            User.update(Auth.user.id, cleaned_data)
+            Auth.user.update()
+            self.root.refresh_windows(window.HOME, window.SETTINGS)
+            self.root.show(window.SETTINGS)
+            self.root.flash_message("User details updated successfully.", "success")
+
+    def __details_error(self, error: Exception):
+        """Re-enables the form when preparing details failed."""
+        self.enable_buttons(self.save_btn)
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    @staticmethod
+    def __prepare_data(data: dict, lock_timer: int | None, password: bytes, email: str) -> dict | None:
+        """
+        Verifies current password and prepares details data to be updated. Runs in background.
+        :param data: Validated form's data.
+        :param lock_timer: New lock timer or None if not changed.
+        :param password: User's current password hash.
+        :param email: User's current email.
+        :return: Changed details or None if current password is wrong.
+        """
+        if not verify_password(password, data["current_password"]):
+            return None
+
+        new_password = KeyPolicy.hash_password(data["new_password"]) if data["new_password"] else None
+        passcode = KeyPolicy.hash_password(data["passcode"]) if data["passcode"] else None
 
-        lock_timer = self.root.LOCK_TIMERS[self.lock_timer_option_menu.get()]
         data_to_update = {
-            "email": data["email"] if data["email"] != Auth.user.email else None,
+            "email": data["email"] if data["email"] != email else None,
             "password": new_password,
             "passcode": passcode,
-            "lock_timer": lock_timer if lock_timer != Auth.user.lock_timer else None
+            "lock_timer": lock_timer
         }
         return {field: value for field, value in data_to_update.items() if value is not None}
@@ -1,12 +1,10 @@
-import os
 import pyperclip
 import customtkinter
 from src.utils import helpers
 from src import style
 from src.utils import window
-from src.libraries.auth import Credentials, Auth
+from src.libraries.auth import Auth, User
 from src.frames.frame_base import FrameBase
-from src.models.models import User
 from src.libraries.password_manager import PasswordManager
 from src.mixins.validator_mixin import InputField
 
@@ -15,6 +13,7 @@ class SignUp(FrameBase):
     """"Sign up" window."""
     def __init__(self, root: PasswordManager, **kwargs):
         super().__init__(root, **kwargs)
+        self.__signing_up = False
         self.__initialize_gui()
 
     def __initialize_gui(self):
@@ -153,6 +152,16 @@ class SignUp(FrameBase):
             lambda event: self.toggle_password_visibility(self.confirm_password_input)
         )
 
+        # Progress bar shown while the account is being created
+        self.progress_bar = customtkinter.CTkProgressBar(
+            self.form_frame,
+            mode="indeterminate",
+            width=350,
+            height=6,
+            progress_color=self.root.THEME_COLORS[style.TURQUOISE].primary,
+            fg_color=self.root.THEME_COLORS[style.TURQUOISE].secondary
+        )
+
         # Submit button
         self.submit_btn = customtkinter.CTkButton(
             self.form_frame,
@@ -184,7 +193,10 @@ class SignUp(FrameBase):
         self.sign_in_btn.place(x=50, y=520)
 
     def __submit(self):
-        """Submit the form with user's details."""
+        """Submit the form with user's details, the account is created in the background."""
+        if self.__signing_up:
+            return
+
         password = self.password_input.get()
         result = self.validate({
             "email": InputField(self.email_input.get(), "required|unique:User"),
@@ -197,22 +209,48 @@ class SignUp(FrameBase):
 
         if not result.errors:
             user = result.passed
-            hashed_password = helpers.hash_password(user["password"])
-            key = helpers.generate_password()
-            hashed_key = helpers.hash_password(key)
-            User.create(
-                fields=("email", "password", "key", "salt"),
-                values=(user["email"], hashed_password, hashed_key, os.urandom(16))
-            )
-            Auth.log_in(Credentials(email=user["email"], password=password, key=key))
-            self.successful_log_in()
-            self.root.flash_message("Signed up successfully.", "success")
-            pyperclip.copy(key)
-            self.show_modal(
-                f"Key (copied to clipboard): {key}\n"
-                f"Store this key somewhere safe.\nIt will not be shown again.\n"
-                f"If you lose it, you'll not be able to access your account!",
-                500, 180, ("Got it", True)
+            self.__set_busy(True)
+            self.root.jobs.submit(
+                Auth.sign_up,
+                user["email"],
+                user["password"],
+                on_success=lambda created: self.__finish_sign_up(*created),
+                on_error=self.__sign_up_error
             )
         else:
             self.root.flash_message(next(iter(result.errors.values())), "danger")
+
+    def __finish_sign_up(self, user: User, key: str):
+        """Logs in the new user and shows their key."""
+        self.__set_busy(False)
+        Auth.user = user
+        self.successful_log_in()
+        self.root.flash_message("Signed up successfully.", "success")
+        pyperclip.copy(key)
+        self.show_modal(
+            f"Key (copied to clipboard): {key}\n"
+            f"Store this key somewhere safe.\nIt will not be shown again.\n"
+            f"If you lose it, you'll not be able to access your account!",
+            500, 180, ("Got it", True)
+        )
+
+    def __sign_up_error(self, error: Exception):
+        """Restores the form when creating the account failed."""
+        self.__set_busy(False)
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def __set_busy(self, busy: bool):
+        """
+        Shows or hides the busy indicator and blocks the form while the account is being created.
+        :param busy: True when signing up starts, False when it ends.
+        """
+        self.__signing_up = busy
+
+        if busy:
+            self.submit_btn.configure(text="Signing up...", state=customtkinter.DISABLED)
+            self.progress_bar.place(x=50, y=440)
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.place_forget()
+            self.submit_btn.configure(text="Submit", state=customtkinter.NORMAL)
@@ -1,5 +1,12 @@
-from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from sqlite3 import Row
 from typing import Optional
+from src.libraries.database import Database as Db
+from src.libraries.decryptor import Decryptor
+from src.libraries.key_policy import KeyPolicy
+from src.libraries.vault import Vault
 from src.models.models import User as UserModel
 from src.utils import helpers
 
@@ -17,6 +24,11 @@ class User:
     color_mode: str
     lock_timer: int
     attempts: int = 3
+    decryptor: Decryptor = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Cache of decrypted entries' fields, wiped when passwords get locked or user logs out
+        self.decryptor = Decryptor(self.key)
 
     def update(self):
         """Refreshes user's details."""
@@ -47,30 +59,167 @@ class Credentials:
 class Auth:
     """User's authentication management class."""
     user: Optional[User] = None
+    # Runs independent hash checks and key derivation side by side, they release the GIL
+    checks: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="auth")
 
     @classmethod
-    def log_in(cls, credentials: Credentials):
-        """Authenticates user and creates "auth.User" object."""
+    def authenticate(cls, credentials: Credentials) -> Optional[User]:
+        """
+        Verifies credentials and derives user's encryption key.
+        Doesn't change the authenticated user, so it can be run in the background.
+        :return: "auth.User" object or None if credentials are wrong.
+        """
         user = UserModel.find_by("email = ?", [credentials.email,], limit=1)
 
         if user:
-            if (helpers.verify_password(user["password"], credentials.password)
-                    and helpers.verify_password(user["key"], credentials.key)):
-                cls.user = User(
-                    id=user["id"],
-                    email=user["email"],
-                    password=user["password"],
-                    passcode=user["passcode"],
-                    key=helpers.get_key(credentials.key, user["salt"]),
-                    salt=user["salt"],
-                    theme_color=user["theme_color"],
-                    color_mode=user["color_mode"],
-                    lock_timer=user["lock_timer"]
-                )
-                return True
-        return False
+            key = cls.checks.submit(
+                helpers.get_key, credentials.key, user["salt"], user["kdf_algorithm"], user["kdf_cost"]
+            )
+            verified = [
+                cls.checks.submit(helpers.verify_password, user["password"], credentials.password),
+                cls.checks.submit(helpers.verify_password, user["key"], credentials.key)
+            ]
+
+            if all(future.result() for future in as_completed(verified)):
+                data_key = cls.__unwrap(user, key.result())
+                return cls.__user(cls.__upgrade(user, credentials, data_key), data_key)
+
+            # Derived key is thrown away when any check fails
+            key.cancel()
+        return None
+
+    @classmethod
+    def sign_up(cls, email: str, password: str) -> tuple[User, str]:
+        """
+        Creates user with a generated key and random data key, the entries will be encrypted with.
+        Hashing and key derivation take a while, so it can be run in the background.
+        Doesn't change the authenticated user.
+        :param email: User's email.
+        :param password: User's password.
+        :return: "auth.User" object of the new user and the user's key.
+        """
+        key = helpers.generate_password()
+        data_key = os.urandom(32)
+        columns = {
+            "email": email,
+            "password": KeyPolicy.hash_password(password),
+            "key": KeyPolicy.hash_password(key),
+            **cls.__wrap(data_key, key)
+        }
+        UserModel.create(tuple(columns.keys()), tuple(columns.values()))
+        return cls.__user(UserModel.find_by("email = ?", [email], limit=1), data_key), key
+
+    @staticmethod
+    def __user(user: Row, data_key: bytes) -> User:
+        """
+        Creates "auth.User" object.
+        :param user: Row object of `users` table.
+        :param data_key: Key the entries are encrypted with.
+        """
+        return User(
+            id=user["id"],
+            email=user["email"],
+            password=user["password"],
+            passcode=user["passcode"],
+            key=data_key,
+            salt=user["salt"],
+            theme_color=user["theme_color"],
+            color_mode=user["color_mode"],
+            lock_timer=user["lock_timer"]
+        )
+
+    @staticmethod
+    def __unwrap(user: Row, derived_key: bytes) -> bytes:
+        """
+        Gets the user's data key, the entries are encrypted with.
+        :param user: Row object of `users` table.
+        :param derived_key: Key derived from the user's key, the data key is wrapped with.
+        :return: Data key. Derived key if the data key wasn't wrapped yet, as it encrypts the entries.
+        """
+        return helpers.unwrap_key(user["wrapped_key"], derived_key) if user["wrapped_key"] else derived_key
+
+    @staticmethod
+    def __wrap(data_key: bytes, key: str) -> dict:
+        """
+        Wraps the data key with a key freshly derived from the user's key according to :class:`KeyPolicy`.
+        :param data_key: Key the entries are encrypted with.
+        :param key: User's key.
+        :return: Changed `users` columns.
+        """
+        salt = os.urandom(16)
+        return {
+            "salt": salt,
+            "kdf_algorithm": KeyPolicy.kdf_algorithm,
+            "kdf_cost": KeyPolicy.kdf_cost(),
+            "wrapped_key": helpers.wrap_key(data_key, KeyPolicy.derive_key(key, salt))
+        }
+
+    @classmethod
+    def __upgrade(cls, user: Row, credentials: Credentials, data_key: bytes) -> Row:
+        """
+        Rehashes credentials and wraps the data key with a newly derived key
+        when they don't meet :class:`KeyPolicy` anymore or the data key isn't wrapped yet.
+        :param user: Row object of `users` table.
+        :param credentials: Verified credentials.
+        :param data_key: Key the entries are encrypted with.
+        :return: Up-to-date Row object of `users` table.
+        """
+        hashes = {
+            column: cls.checks.submit(KeyPolicy.hash_password, value)
+            for column, value in (("password", credentials.password), ("key", credentials.key))
+            if KeyPolicy.needs_rehash(user[column])
+        }
+        changes = {}
+
+        if not user["wrapped_key"] or KeyPolicy.needs_new_key(user["kdf_algorithm"], user["kdf_cost"]):
+            changes.update(cls.__wrap(data_key, credentials.key))
+
+        changes.update({column: future.result() for column, future in hashes.items()})
+
+        if not changes:
+            return user
+
+        cls.__save(user, changes, data_key)
+        return UserModel.find_by_id(user["id"])
+
+    @staticmethod
+    def __save(user: Row, changes: dict, data_key: bytes):
+        """
+        Updates the user's row.
+        :param user: Row object of `users` table before the changes.
+        :param changes: Changed columns.
+        :param data_key: Key the entries are encrypted with.
+        """
+        with Db.transaction():
+            if "salt" in changes:
+                # Legacy envelopes are recognised by the salt, rewrite them before it changes
+                Vault.upgrade_envelopes(user["id"], data_key, user["salt"])
+
+            UserModel.update(user["id"], changes)
+
+    @classmethod
+    def verify_any(cls, hashed_passwords: list[bytes], provided_password: str) -> bool:
+        """
+        Verifies the provided password against several hashes at once.
+        :param hashed_passwords: Hashes to check.
+        :param provided_password: Password to verify.
+        :return: True as soon as any hash matches.
+        """
+        checks = [cls.checks.submit(helpers.verify_password, hashed, provided_password)
+                  for hashed in hashed_passwords]
+
+        return any(future.result() for future in as_completed(checks))
+
+    @classmethod
+    def log_in(cls, credentials: Credentials):
+        """Authenticates user and creates "auth.User" object."""
+        cls.user = cls.authenticate(credentials)
+        return cls.user is not None
 
     @classmethod
     def log_out(cls):
-        """Logs out user."""
+        """Logs out user and wipes decrypted entries' fields."""
+        if cls.user:
+            cls.user.decryptor.clear()
+
         cls.user = None
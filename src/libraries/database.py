@@ -1,35 +1,356 @@
+import glob
+import gzip
+import hashlib
 import inspect
+import os
+import shutil
 import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
 from sqlite3 import Row
-from typing import Optional
+from typing import Optional, Dict, Callable, Iterator, BinaryIO
 from src.mixins.query_builder_mixin import QueryBuilderMixin
 from src.libraries.table import TableBase
+from src.libraries.migration import MigrationBase
 from src.utils.helpers import regexp
-from src.models import tables
+from src.models import tables, migrations
+
+
+class BackupRestarted(Exception):
+    """Raised to stop the stepped backup that keeps restarting because other connections write."""
+
+
+class ConnectionPool:
+    """
+    Hands out one sqlite connection per thread. Every connection is set up by the same initializer.
+    Connections of finished threads are closed when a new connection is created.
+    Connections to ":memory:" database are not shared between threads.
+    """
+    def __init__(self, db_host: str, cached_statements: int, initializer: Callable[[sqlite3.Connection], None]):
+        """
+        :param db_host: Path to the database file.
+        :param cached_statements: Number of prepared statements each connection keeps cached.
+        :param initializer: Called with every new connection before it's handed out.
+        """
+        self.db_host = db_host
+        self.cached_statements = cached_statements
+        self.initializer = initializer
+        self.__local = threading.local()
+        self.__connections: list[tuple[threading.Thread, sqlite3.Connection]] = []
+        self.__lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """Gets connection of the current thread, creating it on first use."""
+        conn = getattr(self.__local, "connection", None)
+
+        if conn is None:
+            # Used only by its thread, but may be closed by the thread that closes the pool
+            conn = sqlite3.connect(self.db_host, cached_statements=self.cached_statements, check_same_thread=False)
+            self.initializer(conn)
+            self.__local.connection = conn
+
+            with self.__lock:
+                for thread, finished in [item for item in self.__connections if not item[0].is_alive()]:
+                    finished.close()
+                    self.__connections.remove((thread, finished))
+
+                self.__connections.append((threading.current_thread(), conn))
+
+        return conn
+
+    def close(self):
+        """Closes connections of all threads."""
+        with self.__lock:
+            for _, conn in self.__connections:
+                conn.close()
+
+            self.__connections.clear()
+
+        self.__local = threading.local()
 
 
 class Database(QueryBuilderMixin):
     """Sqlite database management class."""
-    conn: Optional[sqlite3.Connection] = None
+    PROFILES: Dict[str, Dict[str, str | int]] = {
+        # Sqlite's defaults: rollback journal, synchronous=FULL
+        "default": {},
+        # Readers are not blocked by writer, every commit is durable
+        "safe": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "busy_timeout": 5000
+        },
+        # Commits survive an application crash, but the last ones may be lost on power loss or OS crash.
+        # Large vaults are read from memory-mapped pages
+        "performance": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -32000,  # KiB
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000
+        }
+    }
+    DIAGNOSTIC_PRAGMAS: tuple = (
+        "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout", "page_size"
+    )
+    BACKUP_PAGES: int = 256  # Pages copied per backup step
+    BACKUP_SLEEP: float = 0.005  # Seconds between backup steps, lets other connections write
+    BACKUP_RESTARTS: int = 3  # Restarts caused by other connections' writes before copying in a single step
+    RETURNING: bool = sqlite3.sqlite_version_info >= (3, 35, 0)  # Sqlite supports RETURNING clause
+
+    pool: Optional[ConnectionPool] = None
+    profile: Optional[str] = None
+    search_index: bool = False  # FTS5 shadow tables of TableBase.search_index columns are kept
+    __state: threading.local = threading.local()
+    __existing_tables: Optional[set] = None
 
     @classmethod
-    def create_connection(cls, db_host: str):
-        """Creates connection to the database."""
+    def create_connection(cls, db_host: str, profile: str = "default", cached_statements: int = 128,
+                          search_index: bool = False):
+        """
+        Creates pool of per-thread connections to the database and migrates the schema.
+        :param db_host: Path to the database file.
+        :param profile: Name of PRAGMA settings profile from PROFILES, applied to every connection.
+        :param cached_statements: Number of prepared statements each connection keeps cached.
+        :param search_index: Create FTS5 shadow tables used by full text mode of Model.search.
+            Once created, they are kept in sync by triggers on every write.
+        """
+        if profile not in cls.PROFILES:
+            raise KeyError(profile)
+
+        cls.profile = profile
+        cls.search_index = search_index
+
         try:
-            cls.conn = sqlite3.connect(db_host)
-            cls.conn.create_function("REGEXP", 2, regexp)
-            cls.create_tables()
+            cls.pool = ConnectionPool(db_host, cached_statements, cls.__set_up_connection)
+            cls.migrate()
+            cls.create_search_indexes()
         except sqlite3.Error as e:
             print(e)
 
+    @classmethod
+    def connection(cls) -> sqlite3.Connection:
+        """
+        Gets connection to the database for the current thread.
+        :raises sqlite3.ProgrammingError: If the connections were closed.
+        """
+        if cls.pool is None:
+            raise sqlite3.ProgrammingError("Connection to the database is closed")
+
+        return cls.pool.connection()
+
+    @classmethod
+    def __set_up_connection(cls, conn: sqlite3.Connection):
+        """Registers functions and applies PRAGMA settings profile to the new connection."""
+        conn.create_function("REGEXP", 2, regexp)
+
+        for name, value in cls.PROFILES[cls.profile].items():
+            conn.execute(cls.pragma(name, value).build().statement)
+
+    @classmethod
+    def pragmas(cls) -> Dict[str, str | int]:
+        """Gets effective values of PRAGMA settings of the current thread's connection, for diagnostics."""
+        return {name: cls.pragma(name).get_one()[0] for name in cls.DIAGNOSTIC_PRAGMAS}
+
     @classmethod
     def close_connection(cls):
-        """Closes connection to the database."""
-        if cls.conn:
-            cls.conn.close()
+        """Closes connections to the database."""
+        if cls.pool:
+            cls.pool.close()
+            cls.pool = None
         else:
             print("There is no open connection")
 
+    @classmethod
+    def backup(cls, directory: str, keep: int = 5,
+               progress: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
+        """
+        Writes gzip compressed snapshot of the database while it stays in use.
+        Nothing is written if the database files weren't modified since the newest snapshot was started
+        or the copied pages are identical to the newest snapshot, e.g. after a checkpoint rewrote the file.
+        Pages are copied in steps of BACKUP_PAGES with BACKUP_SLEEP pause between them. Writes of other
+        connections restart the copy, after BACKUP_RESTARTS restarts the rest is copied in a single step.
+        Only `keep` newest snapshots are kept in the directory.
+        :param directory: Directory of the snapshots.
+        :param keep: Number of snapshots to keep, at least 1.
+        :param progress: Called after every step with number of remaining and total pages.
+        :return: Path of the snapshot - `{database}-{timestamp}.db.gz` or None if the database is unchanged.
+        :raises ValueError: If `keep` is less than 1.
+        """
+        if keep < 1:
+            raise ValueError("At least one snapshot must be kept")
+
+        name = os.path.splitext(os.path.basename(cls.pool.db_host))[0]
+        snapshots = cls.__snapshots(directory, name)
+
+        if snapshots and cls.__modified() <= os.path.getmtime(snapshots[-1]):
+            return None
+
+        started = time.time()
+        restarts = 0
+        previous = None
+
+        def step(_status: int, remaining: int, total: int):
+            nonlocal restarts, previous
+
+            if previous is not None and remaining > previous:
+                restarts += 1
+
+                if restarts > cls.BACKUP_RESTARTS:
+                    raise BackupRestarted()
+
+            previous = remaining
+
+            if progress:
+                progress(remaining, total)
+            time.sleep(cls.BACKUP_SLEEP)
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}-{datetime.now():%Y%m%d-%H%M%S}.db.gz")
+        copy = f"{path}.tmp"
+
+        try:
+            target = sqlite3.connect(copy)
+
+            try:
+                cls.connection().backup(target, pages=cls.BACKUP_PAGES, progress=step)
+            except BackupRestarted:
+                cls.connection().backup(target)
+            finally:
+                target.close()
+
+            if snapshots and cls.__same_content(copy, snapshots[-1]):
+                # Content is unchanged, the newest snapshot stays the one to compare modifications with
+                os.utime(snapshots[-1], (started, started))
+                return None
+
+            with open(copy, "rb") as source, gzip.open(f"{path}.part", "wb") as compressed:
+                shutil.copyfileobj(source, compressed)
+
+            # Writes made while copying are newer than the snapshot
+            os.utime(f"{path}.part", (started, started))
+            os.replace(f"{path}.part", path)
+        finally:
+            for leftover in (copy, f"{path}.part"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+        for old in cls.__snapshots(directory, name)[:-keep]:
+            os.remove(old)
+
+        return path
+
+    @staticmethod
+    def __same_content(copy: str, snapshot: str) -> bool:
+        """
+        Compares SHA-256 digests of the database copy and the decompressed snapshot, read in chunks.
+        Damaged snapshot never has the same content.
+        """
+        def digest(file: BinaryIO) -> bytes:
+            hashed = hashlib.sha256()
+
+            with file:
+                while chunk := file.read(1024 * 1024):
+                    hashed.update(chunk)
+
+            return hashed.digest()
+
+        try:
+            return digest(open(copy, "rb")) == digest(gzip.open(snapshot, "rb"))
+        except (OSError, EOFError, zlib.error):
+            return False
+
+    @staticmethod
+    def __snapshots(directory: str, name: str) -> list[str]:
+        """Gets paths of the database's snapshots in the directory, oldest first."""
+        return sorted(glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(name)}-*.db.gz")))
+
+    @classmethod
+    def __modified(cls) -> float:
+        """Gets time of the last modification of the database file or its write-ahead log."""
+        files = (cls.pool.db_host, f"{cls.pool.db_host}-wal")
+        return max(os.path.getmtime(file) for file in files if os.path.exists(file))
+
+    @classmethod
+    def restore(cls, snapshot: str):
+        """
+        Replaces content of the database with the snapshot made by :meth:`backup`.
+        Snapshot is decompressed and checked with PRAGMA integrity_check first, it must have the application's
+        tables and a schema version it can be migrated from. The database is left untouched if a check fails.
+        Content is copied by sqlite, so open connections see the restored data.
+        The schema is migrated if the snapshot is older than the application.
+        :param snapshot: Path of the snapshot.
+        :raises sqlite3.DatabaseError: If the snapshot is damaged or isn't a database of the application.
+        """
+        copy = f"{cls.pool.db_host}.restore"
+
+        try:
+            with gzip.open(snapshot, "rb") as compressed, open(copy, "wb") as target:
+                shutil.copyfileobj(compressed, target)
+
+            source = sqlite3.connect(copy)
+
+            try:
+                result = source.execute(cls.pragma("integrity_check").build().statement).fetchone()[0]
+
+                if result != "ok":
+                    raise sqlite3.DatabaseError(f"Snapshot failed integrity check: {result}")
+
+                version = source.execute(cls.pragma("user_version").build().statement).fetchone()[0]
+                existing = {row[0] for row in source.execute(
+                    cls.select("sqlite_master", ("name",)).where("type = 'table'", []).build().statement
+                )}
+                required = {
+                    subject["class"].name for subject in cls.__get_tables_info()
+                    if subject["base_classes"][0] is TableBase
+                }
+
+                if not 1 <= version <= max(migration.version for migration in cls.__get_migrations()):
+                    raise sqlite3.DatabaseError(f"Snapshot has unsupported schema version {version}")
+
+                if not required <= existing:
+                    raise sqlite3.DatabaseError(f"Snapshot has no tables {", ".join(sorted(required - existing))}")
+
+                source.backup(cls.connection(), pages=cls.BACKUP_PAGES, sleep=cls.BACKUP_SLEEP)
+            finally:
+                source.close()
+        finally:
+            if os.path.exists(copy):
+                os.remove(copy)
+
+        cls.__existing_tables = None
+        cls.migrate()
+        cls.create_search_indexes()
+
+    @classmethod
+    def migrate(cls):
+        """
+        Applies migrations defined in src.models.migrations newer than the schema version
+        (PRAGMA user_version). Each migration runs in its own transaction.
+        """
+        current_version = cls.pragma("user_version").get_one()[0]
+
+        for migration in cls.__get_migrations():
+            if migration.version > current_version:
+                with cls.transaction():
+                    migration.up(cls)
+                    cls.pragma("user_version", migration.version).run()
+
+                cls.__existing_tables = None
+
+    @classmethod
+    def table_exists(cls, name: str) -> bool:
+        """Checks if the table exists in the database."""
+        if cls.__existing_tables is None:
+            cls.__existing_tables = {
+                row["name"] for row in cls.select("sqlite_master", ("name",)).where("type = 'table'", []).get()
+            }
+        return name in cls.__existing_tables
+
     @classmethod
     def create_tables(cls):
         """Creates tables defined in src.models.tables."""
@@ -38,31 +359,166 @@ class Database(QueryBuilderMixin):
         for subject in classes_info:
             if subject["base_classes"][0] is TableBase:
                 cls.create_table(subject["class"]).run()
+                cls.create_indexes(subject["class"])
+
+    @classmethod
+    def create_indexes(cls, table: type[TableBase]):
+        """Creates indexes declared in :class:`TableBase`.indexes and :class:`TableBase`.unique."""
+        for columns in table.indexes or ():
+            cls.create_index(table, columns).run()
+
+        for columns in table.unique or ():
+            cls.create_index(table, columns, unique=True).run()
+
+    @classmethod
+    def create_search_indexes(cls):
+        """Creates FTS5 shadow tables of tables defined in src.models.tables, if they are enabled."""
+        if not cls.search_index:
+            return
+
+        for subject in cls.__get_tables_info():
+            if subject["base_classes"][0] is TableBase and subject["class"].search_index:
+                cls.create_search_index(subject["class"])
+
+    @classmethod
+    def create_search_index(cls, table: type[TableBase]) -> bool:
+        """
+        Creates FTS5 shadow table `{table.name}_fts` for :class:`TableBase`.search_index columns.
+        The shadow table is kept in sync with the table by triggers, rows stored before are indexed on creation.
+        :return: False if sqlite was compiled without FTS5.
+        """
+        fts = f"{table.name}_fts"
+        columns = ", ".join(table.search_index)
+        new_values = ", ".join(f"new.{column}" for column in table.search_index)
+        old_values = ", ".join(f"old.{column}" for column in table.search_index)
+        delete = f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values})"
+        insert = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values})"
+
+        if cls.table_exists(fts):
+            return True
+
+        with cls.transaction():
+            try:
+                cls.create_virtual_table(
+                    fts, "fts5", (*table.search_index, f"content='{table.name}'", "content_rowid='id'")
+                ).run()
+            except sqlite3.OperationalError:
+                return False
+
+            cls.create_trigger(f"{fts}_ai", "AFTER INSERT", table, (insert,)).run()
+            cls.create_trigger(f"{fts}_ad", "AFTER DELETE", table, (delete,)).run()
+            cls.create_trigger(f"{fts}_au", f"AFTER UPDATE OF {columns}", table, (delete, insert)).run()
+            cls.insert(fts, (fts,), ("rebuild",)).run()
+
+        cls.__existing_tables = None
+        return True
+
+    @classmethod
+    def ensure_column(cls, table: type[TableBase], column: str):
+        """
+        Adds the column declared in :class:`TableBase`.columns to the existing table.
+        Does nothing if the table already has the column, e.g. it was created from the current declaration.
+        :param table: Table model(:class:`TableBase`) object.
+        :param column: Name of the column.
+        """
+        existing = {row["name"] for row in cls.pragma(f"table_info({table.name})").get()}
+
+        if column not in existing:
+            cls.add_column(table, column, table.columns[column]).run()
+
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """
+        Executes queries run inside `with` block in a single transaction, committed once on exit.
+        Transactions are per thread, as are connections.
+        Nested blocks are savepoints: an exception rolls back only the innermost block it leaves.
+        """
+        depth = cls.__transaction_depth()
+        conn = cls.connection()
+        savepoint = f"savepoint_{depth}"
+        # IMMEDIATE takes the write lock up front, waiting for other threads' writes to finish
+        conn.execute("BEGIN IMMEDIATE" if depth == 0 else f"SAVEPOINT {savepoint}")
+        cls.__state.depth = depth + 1
+
+        try:
+            yield
+        except BaseException:
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            if depth == 0:
+                conn.commit()
+            else:
+                conn.execute(f"RELEASE {savepoint}")
+        finally:
+            cls.__state.depth = depth
 
     @classmethod
-    def run(cls) -> int:
+    def __transaction_depth(cls) -> int:
+        """Gets number of open transaction blocks in the current thread."""
+        return getattr(cls.__state, "depth", 0)
+
+    def run(self) -> int:
         """Executes query and returns number of affected rows."""
-        cursor = cls.conn.cursor()
-        query = cls.build()
+        conn = self.connection()
+        cursor = conn.cursor()
+        query = self.build()
 
         if query.parameters:
-            if isinstance(query.parameters, list):
+            if query.many:
                 cursor.executemany(query.statement, query.parameters)
             else:
                 cursor.execute(query.statement, query.parameters)
         else:
             cursor.execute(query.statement)
 
-        cls.conn.commit()
+        if not self.__transaction_depth():
+            conn.commit()
+
         results = cursor.rowcount
         cursor.close()
         return results
 
-    @classmethod
-    def get(cls) -> list[Row]:
+    def run_returning(self) -> list[Row]:
+        """
+        Executes writing query with RETURNING clause and returns list of the returned Row objects.
+        Multi-row parameters are executed row by row in the statement's order, executemany discards returned rows.
+        """
+        return [row for cursor in self.__run_each() for row in cursor.fetchall()]
+
+    def run_lastrowids(self) -> list[int]:
+        """
+        Executes INSERT query and returns ids of the inserted rows - fallback of RETURNING for sqlite < 3.35.
+        Rows skipped by OR IGNORE have no id.
+        """
+        return [cursor.lastrowid for cursor in self.__run_each() if cursor.rowcount > 0]
+
+    def __run_each(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Executes query once per row of parameters in a single transaction, yielding the cursor after every execution.
+        """
+        query = self.build()
+        cursor = self.connection().cursor()
+        cursor.row_factory = sqlite3.Row
+
+        try:
+            with self.transaction():
+                for parameters in query.parameters if query.many else (query.parameters or (),):
+                    cursor.execute(query.statement, parameters)
+                    yield cursor
+        finally:
+            cursor.close()
+
+    def get(self) -> list[Row]:
         """Executes query and returns list of Row objects."""
-        cursor = cls.conn.cursor()
-        query = cls.build()
+        conn = self.connection()
+        cursor = conn.cursor()
+        query = self.build()
 
         if query.parameters:
             cursor.execute(query.statement, query.parameters)
@@ -74,11 +530,11 @@ class Database(QueryBuilderMixin):
         cursor.close()
         return result
 
-    @classmethod
-    def get_one(cls) -> Row:
+    def get_one(self) -> Row:
         """Executes query and returns Row object."""
-        cursor = cls.conn.cursor()
-        query = cls.build()
+        conn = self.connection()
+        cursor = conn.cursor()
+        query = self.build()
 
         if query.parameters:
             cursor.execute(query.statement, query.parameters)
@@ -90,6 +546,14 @@ class Database(QueryBuilderMixin):
         cursor.close()
         return result
 
+    @staticmethod
+    def __get_migrations() -> list[type[MigrationBase]]:
+        """Gets migration classes defined in src.models.migrations ordered by version."""
+        return sorted(
+            (obj for _, obj in inspect.getmembers(migrations, inspect.isclass) if obj.__bases__[0] is MigrationBase),
+            key=lambda migration: migration.version
+        )
+
     @staticmethod
     def __get_tables_info() -> list:
         """Gets information about the classes defined in src.models.tables."""
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from sqlite3 import Row
+from typing import Iterable
+from src.utils import helpers
+
+CACHE_SIZE = 512
+
+
+class Decryptor:
+    """
+    Decrypts entries' fields on demand and keeps the most recently used results.
+    Results are keyed by entry's id and ciphertext, so a changed entry is never served stale.
+    """
+    def __init__(self, key: bytes, maxsize: int = CACHE_SIZE):
+        """
+        :param key: Key the entries are encrypted with.
+        :param maxsize: Number of decrypted fields kept.
+        """
+        self.key = key
+        self.maxsize = maxsize
+        self.__decrypted: OrderedDict[tuple[int, bytes], str] = OrderedDict()
+
+    def get(self, entry: Row, field: str, cache: bool = True) -> str:
+        """
+        Gets decrypted value of the entry's field, decrypting it if it's not cached.
+        :param entry: Row object of `passwords` table.
+        :param field: Encrypted column - "username" or "password".
+        :param cache: Keep the decrypted value, e.g. not while the passwords are locked.
+        :return: Decrypted value.
+        """
+        cache_key = (entry["id"], entry[field])
+
+        if cache_key in self.__decrypted:
+            self.__decrypted.move_to_end(cache_key)
+            return self.__decrypted[cache_key]
+
+        value = helpers.decrypt_data(entry[field], self.key)
+
+        if not cache:
+            return value
+
+        self.__decrypted[cache_key] = value
+
+        if len(self.__decrypted) > self.maxsize:
+            self.__decrypted.popitem(last=False)
+
+        return value
+
+    def is_decrypted(self, entry: Row, field: str) -> bool:
+        """Checks if the entry's field is cached."""
+        return (entry["id"], entry[field]) in self.__decrypted
+
+    def warm(self, entries: Iterable[Row], field: str):
+        """
+        Decrypts the field of entries in advance.
+        :param entries: Row objects of `passwords` table.
+        :param field: Encrypted column - "username" or "password".
+        """
+        for entry in entries:
+            self.get(entry, field)
+
+    def forget(self, __id: int):
+        """Drops decrypted fields of the entry."""
+        for cache_key in [cache_key for cache_key in self.__decrypted if cache_key[0] == __id]:
+            del self.__decrypted[cache_key]
+
+    def clear(self):
+        """Drops all decrypted fields."""
+        self.__decrypted.clear()
@@ -0,0 +1,422 @@
+import argparse
+import csv
+import getpass
+import json
+import os
+import struct
+from sqlite3 import Row
+from typing import Iterator, Optional, Callable, BinaryIO
+from xml.sax.saxutils import escape
+from Crypto.Cipher import AES
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.pdfencrypt import StandardEncryption
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Flowable
+from src.libraries.jobs import Job
+from src.libraries.key_policy import KeyPolicy
+from src.utils import helpers
+
+
+class ExportDocTemplate(SimpleDocTemplate):
+    """
+    Document template pulling flowables from a generator while the document is built, reporting layout
+    progress to the job and stopping when it's cancelled.
+    """
+    def __init__(self, filename: str, flowables: Iterator[Flowable], job: Optional[Job] = None, rows: int = 0,
+                 **kwargs):
+        """
+        :param filename: Path of the pdf file.
+        :param flowables: Flowables appended to the story as it's laid out.
+        :param job: Job to report progress to.
+        :param rows: Number of table rows to lay out, without headers.
+        """
+        super().__init__(filename, **kwargs)
+        self.flowables = flowables
+        self.job = job
+        self.rows = rows
+        self.laid_out = 0
+
+    def filterFlowables(self, flowables: list[Flowable]):
+        """Keeps the next flowable queued behind the one being laid out, so only two are held at once."""
+        # Flowables waiting for the first page are filtered as well
+        if flowables is self._hanging:
+            return
+
+        while len(flowables) < 2 and (flowable := next(self.flowables, None)) is not None:
+            flowables.append(flowable)
+
+    def afterFlowable(self, flowable: Flowable):
+        """Reports progress after every laid out part of the table."""
+        if self.job and isinstance(flowable, LongTable):
+            # Every part of the table split across pages starts with the header row
+            self.laid_out += flowable._nrows - 1
+            self.job.check()
+            self.job.report(self.laid_out / max(self.rows, 1), "Writing document")
+
+
+class EncryptedStream:
+    """
+    Writes data encrypted with a password-derived key as a sequence of AES-GCM chunks, so memory use
+    doesn't depend on the size of the data.
+    File: header - magic, version, KDF algorithm and cost, salt and nonce prefix,
+    followed by chunks - ciphertext length, last chunk flag, tag and ciphertext.
+    Every chunk is authenticated together with the header, its number and the last chunk flag,
+    so chunks can't be reordered, dropped or the stream truncated unnoticed.
+    """
+    MAGIC: bytes = b"PMX"
+    VERSION: int = 1
+    CHUNK_SIZE: int = 64 * 1024
+    NONCE_PREFIX_SIZE: int = 8
+    CHUNK_HEADER: struct.Struct = struct.Struct(">IB")
+
+    def __init__(self, file: BinaryIO, password: str):
+        """
+        :param file: Binary file to write to.
+        :param password: Password the key is derived from according to :class:`KeyPolicy`.
+        """
+        salt = os.urandom(16)
+        algorithm = KeyPolicy.kdf_algorithm.encode()
+        self.file = file
+        self.key = KeyPolicy.derive_key(password, salt)
+        self.nonce_prefix = os.urandom(self.NONCE_PREFIX_SIZE)
+        self.header = b"".join((
+            self.MAGIC, bytes((self.VERSION, len(algorithm))), algorithm,
+            struct.pack(">I", KeyPolicy.kdf_cost()), salt, self.nonce_prefix
+        ))
+        self.counter = 0
+        self.buffer = bytearray()
+        self.file.write(self.header)
+
+    def write(self, data: bytes | str):
+        """Buffers data and writes every full chunk."""
+        self.buffer += data.encode() if isinstance(data, str) else data
+
+        while len(self.buffer) > self.CHUNK_SIZE:
+            self.__write_chunk(bytes(self.buffer[:self.CHUNK_SIZE]), last=False)
+            del self.buffer[:self.CHUNK_SIZE]
+
+    def close(self):
+        """Writes the last chunk. Stream without it is recognised as truncated."""
+        self.__write_chunk(bytes(self.buffer), last=True)
+        self.buffer.clear()
+
+    def __write_chunk(self, data: bytes, last: bool):
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=self.nonce_prefix + struct.pack(">I", self.counter))
+        cipher.update(self.header + struct.pack(">IB", self.counter, last))
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        self.file.write(self.CHUNK_HEADER.pack(len(ciphertext), last) + tag + ciphertext)
+        self.counter += 1
+
+    @classmethod
+    def read(cls, file: BinaryIO, password: str) -> Iterator[bytes]:
+        """
+        Decrypts stream written by :class:`EncryptedStream` chunk by chunk.
+        :param file: Binary file to read from.
+        :param password: Password the stream was encrypted with.
+        :return: Generator of decrypted chunks.
+        :raises ValueError: If the password is wrong or the stream was modified or truncated.
+        """
+        prefix = file.read(len(cls.MAGIC) + 2)
+
+        if len(prefix) < len(cls.MAGIC) + 2 or prefix[:len(cls.MAGIC)] != cls.MAGIC or prefix[-2] != cls.VERSION:
+            raise ValueError("Not an encrypted export")
+
+        algorithm = file.read(prefix[-1])
+        cost = file.read(4)
+        salt = file.read(16)
+        nonce_prefix = file.read(cls.NONCE_PREFIX_SIZE)
+        header = prefix + algorithm + cost + salt + nonce_prefix
+        key = helpers.get_key(password, salt, algorithm.decode(), struct.unpack(">I", cost)[0])
+        counter = 0
+
+        while True:
+            chunk_header = file.read(cls.CHUNK_HEADER.size)
+
+            if len(chunk_header) < cls.CHUNK_HEADER.size:
+                raise ValueError("Encrypted export is truncated")
+
+            size, last = cls.CHUNK_HEADER.unpack(chunk_header)
+            tag = file.read(16)
+            cipher = AES.new(key, AES.MODE_GCM, nonce=nonce_prefix + struct.pack(">I", counter))
+            cipher.update(header + struct.pack(">IB", counter, last))
+
+            try:
+                data = cipher.decrypt_and_verify(file.read(size), tag)
+            except ValueError:
+                raise ValueError("Wrong password or the encrypted export was modified") from None
+
+            yield data
+
+            if last:
+                return
+
+            counter += 1
+
+
+class Export:
+    """Exports user's entries. Runs in the background: entries are decrypted without the UI's cache."""
+    HEADER: tuple = ("Web/App", "Username", "Password")
+    FIELDS: tuple = ("account", "username", "password")  # Columns of CSV and keys of JSON Lines records
+    # File type description and file name suffix of the formats
+    FORMATS: dict[str, tuple[str, str]] = {
+        "pdf": ("PDF files", ".pdf"),
+        "csv": ("Encrypted CSV files", ".csv.enc"),
+        "jsonl": ("Encrypted JSON Lines files", ".jsonl.enc")
+    }
+    CHUNK_SIZE: int = 200  # Entries decrypted at once and rows per table flowable
+    # Table cells wrap long values, breaking them anywhere as passwords have no spaces
+    CELL_STYLE: ParagraphStyle = ParagraphStyle(
+        "ExportCell", fontName="Helvetica-Bold", fontSize=12, leading=14, alignment=TA_CENTER, wordWrap="CJK"
+    )
+    TABLE_STYLE: TableStyle = TableStyle([
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+    @classmethod
+    def rows(cls, entries: list[Row], key: bytes, job: Optional[Job] = None,
+             progress_weight: float = 1.0) -> Iterator[list[tuple[str, str, str]]]:
+        """
+        Decrypts entries chunk by chunk.
+        :param entries: Row objects of `passwords` table.
+        :param key: Key the entries are encrypted with.
+        :param job: Job to report progress to and check for cancellation.
+        :param progress_weight: Share of the job's progress taken by decryption, 0 doesn't report progress.
+        :return: Generator of chunks of (account, username, password) rows.
+        """
+        for start in range(0, len(entries), cls.CHUNK_SIZE):
+            if job:
+                job.check()
+
+            chunk = entries[start:start + cls.CHUNK_SIZE]
+            values = helpers.decrypt_many(
+                [entry[column] for entry in chunk for column in ("username", "password")], key
+            )
+            yield [(entry["account"], values[2 * i], values[2 * i + 1]) for i, entry in enumerate(chunk)]
+
+            if job and progress_weight:
+                done = min(start + cls.CHUNK_SIZE, len(entries))
+                job.report(progress_weight * done / len(entries), f"Decrypted {done} of {len(entries)}")
+
+    @classmethod
+    def file_types(cls) -> list[tuple[str, str]]:
+        """Gets file types of the formats for file dialogs - [("PDF files", "*.pdf"), ...]."""
+        return [(description, f"*{suffix}") for description, suffix in cls.FORMATS.values()]
+
+    @classmethod
+    def format_of(cls, path: str) -> str:
+        """
+        Gets format of the file by its suffix.
+        :raises ValueError: If the suffix isn't one of FORMATS.
+        """
+        for name, (_, suffix) in cls.FORMATS.items():
+            if path.lower().endswith(suffix):
+                return name
+
+        raise ValueError(f"Unknown export format of \"{os.path.basename(path)}\".")
+
+    @classmethod
+    def target(cls, path: str, file_type: str) -> tuple[str, str]:
+        """
+        Resolves path and format of the file chosen in a file dialog.
+        Format of the chosen file type is used, its suffix is appended if the path doesn't have it.
+        Other file types are exported in the format matching the path's suffix.
+        :param path: Chosen path.
+        :param file_type: Description of the chosen file type - "PDF files", ...
+        :return: (path, format).
+        :raises ValueError: If the format can't be determined.
+        """
+        for name, (description, suffix) in cls.FORMATS.items():
+            if description == file_type:
+                return (path if path.lower().endswith(suffix) else f"{path}{suffix}"), name
+
+        return path, cls.format_of(path)
+
+    @classmethod
+    def to_file(cls, path: str, entries: list[Row], key: bytes, title: str, password: str,
+                export_format: Optional[str] = None, job: Optional[Job] = None) -> int:
+        """
+        Exports entries in the given format or the one matching the file's suffix - FORMATS.
+        :param path: Path of the file.
+        :param entries: Row objects of `passwords` table.
+        :param key: Key the entries are encrypted with.
+        :param title: Title of the PDF document.
+        :param password: Password protecting the file.
+        :param export_format: One of FORMATS, taken from the path's suffix if not set.
+        :param job: Job to report progress to and check for cancellation.
+        :return: Number of exported entries.
+        :raises ValueError: If the format is unknown.
+        """
+        export_format = export_format or cls.format_of(path)
+
+        if export_format not in cls.FORMATS:
+            raise ValueError(f"Unknown export format \"{export_format}\".")
+
+        if export_format == "pdf":
+            return cls.pdf(path, entries, key, title, password, job)
+
+        return getattr(cls, export_format)(path, entries, key, password, job)
+
+    @classmethod
+    def csv(cls, path: str, entries: list[Row], key: bytes, password: str, job: Optional[Job] = None) -> int:
+        """
+        Writes entries as CSV with FIELDS header, encrypted by :class:`EncryptedStream`.
+        :param path: Path of the file.
+        :param entries: Row objects of `passwords` table.
+        :param key: Key the entries are encrypted with.
+        :param password: Password the file's key is derived from.
+        :param job: Job to report progress to and check for cancellation.
+        :return: Number of exported entries.
+        """
+        def write(stream: EncryptedStream):
+            writer = csv.writer(stream)
+            writer.writerow(cls.FIELDS)
+
+            for rows in cls.rows(entries, key, job):
+                writer.writerows(rows)
+
+        return cls.__stream(path, password, write, len(entries))
+
+    @classmethod
+    def jsonl(cls, path: str, entries: list[Row], key: bytes, password: str, job: Optional[Job] = None) -> int:
+        """
+        Writes entries as JSON Lines records with FIELDS keys, encrypted by :class:`EncryptedStream`.
+        :param path: Path of the file.
+        :param entries: Row objects of `passwords` table.
+        :param key: Key the entries are encrypted with.
+        :param password: Password the file's key is derived from.
+        :param job: Job to report progress to and check for cancellation.
+        :return: Number of exported entries.
+        """
+        def write(stream: EncryptedStream):
+            for rows in cls.rows(entries, key, job):
+                for row in rows:
+                    stream.write(f"{json.dumps(dict(zip(cls.FIELDS, row)), ensure_ascii=False)}\n")
+
+        return cls.__stream(path, password, write, len(entries))
+
+    @staticmethod
+    def __stream(path: str, password: str, write: Callable[[EncryptedStream], None], count: int) -> int:
+        """
+        Opens encrypted stream to the file and writes content. Partially written file is removed if writing fails.
+        :param path: Path of the file.
+        :param password: Password the file's key is derived from.
+        :param write: Writes the content to the stream.
+        :param count: Number of exported entries.
+        :return: Number of exported entries.
+        """
+        try:
+            with open(path, "wb") as file:
+                stream = EncryptedStream(file, password)
+                write(stream)
+                stream.close()
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+        return count
+
+    @staticmethod
+    def decrypt(path: str, output: str, password: str):
+        """
+        Decrypts file written by :meth:`csv` or :meth:`jsonl` chunk by chunk. Partially written output is removed
+        if decryption fails.
+        :param path: Path of the encrypted file.
+        :param output: Path of the decrypted file.
+        :param password: Password the file was exported with.
+        :raises ValueError: If the password is wrong, the file isn't an export or it was modified or truncated.
+        """
+        if os.path.exists(output) and os.path.samefile(path, output):
+            raise ValueError("Decrypted file can't replace the encrypted one.")
+
+        try:
+            with open(path, "rb") as file, open(output, "wb") as target:
+                for chunk in EncryptedStream.read(file, password):
+                    target.write(chunk)
+        except BaseException:
+            if os.path.exists(output):
+                os.remove(output)
+            raise
+
+    @classmethod
+    def pdf(cls, path: str, entries: list[Row], key: bytes, title: str, password: str,
+            job: Optional[Job] = None) -> int:
+        """
+        Writes password protected pdf file with entries' table.
+        Table is split into flowables of CHUNK_SIZE rows, which are broken across pages by their measured
+        heights, every page repeats the header. Chunks are decrypted as the document is laid out, so only
+        a couple of them are held in memory. Partially written file is removed if the export fails.
+        :param path: Path of the pdf file.
+        :param entries: Row objects of `passwords` table.
+        :param key: Key the entries are encrypted with.
+        :param title: Title of the document.
+        :param password: Password of the document.
+        :param job: Job to report progress to and check for cancellation.
+        :return: Number of exported entries.
+        """
+        def tables() -> Iterator[LongTable]:
+            for rows in cls.rows(entries, key, job, progress_weight=0):
+                cells = [[Paragraph(escape(value), cls.CELL_STYLE) for value in row] for row in rows]
+                table = LongTable([cls.HEADER, *cells], colWidths=[column_width] * len(cls.HEADER), repeatRows=1)
+                table.setStyle(cls.TABLE_STYLE)
+                yield table
+
+        doc = ExportDocTemplate(
+            path,
+            tables(),
+            job=job,
+            rows=len(entries),
+            pagesize=A4,
+            topMargin=inch,
+            bottomMargin=inch,
+            encrypt=StandardEncryption(userPassword=password, canPrint=1)
+        )
+        column_width = doc.width / len(cls.HEADER)
+
+        try:
+            doc.build([Paragraph(escape(title), getSampleStyleSheet()["Title"])])
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+        return len(entries)
+
+
+def main(argv: Optional[list[str]] = None):
+    """Decrypts encrypted CSV or JSON Lines export, asking for the password it was exported with."""
+    parser = argparse.ArgumentParser(prog="python -m src.libraries.export",
+                                     description="Decrypt encrypted CSV and JSON Lines exports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    decrypt = commands.add_parser("decrypt", help="decrypt .csv.enc or .jsonl.enc file")
+    decrypt.add_argument("file", help="encrypted export")
+    decrypt.add_argument("output", nargs="?", help="decrypted file, the export's name without .enc by default")
+    args = parser.parse_args(argv)
+
+    output = args.output or (args.file[:-len(".enc")] if args.file.lower().endswith(".enc") else None)
+
+    if not os.path.isfile(args.file):
+        parser.error(f"{args.file} doesn't exist")
+
+    if not output:
+        parser.error("output is required when the file's name doesn't end with .enc")
+
+    try:
+        Export.decrypt(args.file, output, getpass.getpass("Password: "))
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+
+    print(f"Decrypted to {output}")
+
+
+if __name__ == "__main__":
+    main()
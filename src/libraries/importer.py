@@ -0,0 +1,171 @@
+import csv
+import os
+from dataclasses import dataclass
+from typing import Iterator, Optional, TextIO
+from urllib.parse import urlparse
+from src.libraries.database import Database as Db
+from src.libraries.jobs import Job
+from src.models.models import Password
+from src.utils import helpers
+
+
+class InvalidImportFile(ValueError):
+    """Raised when the CSV file's header doesn't have the columns needed for import."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of :meth:`Importer.csv`."""
+    imported: int
+    skipped: int  # Rows without password, account (or url) or username
+
+
+class CountingReader:
+    """Iterates over lines of the file, counting characters read so far."""
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.read = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.file)
+        self.read += len(line)
+        return line
+
+
+class Importer:
+    """
+    Imports entries from CSV exports of browsers and password managers - Chrome, Firefox, Bitwarden,
+    this application or any file with recognisable header.
+    """
+    BATCH_SIZE: int = 5000  # Rows encrypted and inserted at once
+    # Header names recognised for every field, in order of preference
+    COLUMNS: dict[str, tuple] = {
+        "account": ("account", "web/app", "name", "title"),
+        "url": ("url", "login_uri", "origin", "website", "hostname"),
+        "username": ("username", "login_username", "user", "login", "email"),
+        "password": ("password", "login_password")
+    }
+
+    @classmethod
+    def csv(cls, path: str, user_id: int, key: bytes, mapping: Optional[dict[str, str]] = None,
+            job: Optional[Job] = None) -> ImportResult:
+        """
+        Encrypts and stores entries from the CSV file, every batch of BATCH_SIZE rows in its own transaction,
+        so other writers don't wait for the whole import. Rows missing password, account (or url) or username
+        are skipped and counted, entries require all of them.
+        Batches stored before the import fails or is cancelled are kept.
+        :param path: Path of the CSV file.
+        :param user_id: Owner of the entries.
+        :param key: Key to encrypt the entries with.
+        :param mapping: Header names of the fields - {"account": "Site", "username": "Login", ...},
+            overrides recognised columns.
+        :param job: Job to report progress to and check for cancellation.
+        :return: Numbers of imported and skipped rows.
+        :raises InvalidImportFile: If the header doesn't have the needed columns.
+        """
+        size = max(os.path.getsize(path), 1)
+        imported = 0
+        skipped = 0
+
+        def complete(rows: Iterator[tuple[str, str, str]]) -> Iterator[tuple[str, str, str]]:
+            nonlocal skipped
+
+            for row in rows:
+                if all(row):
+                    yield row
+                else:
+                    skipped += 1
+
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            lines = CountingReader(file)
+            reader = csv.reader(lines)
+            columns = cls.columns(next(reader, []), mapping)
+
+            for batch in cls.__batches(complete(cls.rows(reader, columns))):
+                if job:
+                    job.check()
+
+                values = helpers.encrypt_many([value for _, username, password in batch
+                                               for value in (username, password)], key)
+                with Db.transaction():
+                    Password.create(
+                        ("user_id", "account", "username", "password"),
+                        [(user_id, account, values[2 * i], values[2 * i + 1])
+                         for i, (account, _, _) in enumerate(batch)]
+                    )
+                imported += len(batch)
+
+                if job:
+                    job.report(min(lines.read / size, 1), f"Imported {imported} entries")
+
+        return ImportResult(imported, skipped)
+
+    @classmethod
+    def columns(cls, header: list[str], mapping: Optional[dict[str, str]] = None) -> dict[str, Optional[int]]:
+        """
+        Finds positions of the fields in the header.
+        :param header: First row of the CSV file.
+        :param mapping: Header names of the fields, overrides recognised columns.
+        :return: Index of the column by field - {"account": 0, "url": None, ...}.
+        :raises InvalidImportFile: If a mapped column isn't in the header or there is no password column,
+            no account/url column or no username column.
+        """
+        names = [name.strip().casefold() for name in header]
+        columns = {
+            field: next((names.index(alias) for alias in aliases if alias in names), None)
+            for field, aliases in cls.COLUMNS.items()
+        }
+
+        for field, name in (mapping or {}).items():
+            if name.strip().casefold() not in names:
+                raise InvalidImportFile(f"Column \"{name}\" is not in the file's header.")
+
+            columns[field] = names.index(name.strip().casefold())
+
+        if columns["password"] is None:
+            raise InvalidImportFile("File has no password column.")
+
+        if columns["account"] is None and columns["url"] is None:
+            raise InvalidImportFile("File has no account or url column.")
+
+        if columns["username"] is None:
+            raise InvalidImportFile("File has no username column.")
+
+        return columns
+
+    @staticmethod
+    def rows(reader: Iterator[list[str]], columns: dict[str, Optional[int]]) -> Iterator[tuple[str, str, str]]:
+        """
+        Maps CSV rows to entries.
+        :param reader: CSV rows without the header.
+        :param columns: Positions of the fields - :meth:`columns`.
+        :return: Generator of (account, username, password), empty string for missing values.
+            Account falls back to the url's host.
+        """
+        def value(row: list[str], field: str) -> str:
+            index = columns[field]
+            return row[index] if index is not None and index < len(row) else ""
+
+        for row in reader:
+            url = value(row, "url").strip()
+            account = value(row, "account").strip() or urlparse(url).hostname or url
+            # Passwords are kept as they are, spaces included
+            yield account, value(row, "username").strip(), value(row, "password")
+
+    @classmethod
+    def __batches(cls, rows: Iterator[tuple]) -> Iterator[list[tuple]]:
+        """Groups rows into lists of BATCH_SIZE."""
+        batch = []
+
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) == cls.BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
@@ -0,0 +1,174 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+from typing import Optional, Callable, Any
+import customtkinter
+
+
+class JobCancelled(Exception):
+    """Raised inside a task to stop it after its :class:`Job` was cancelled."""
+
+
+class Job:
+    """Handle of a task submitted to :class:`JobScheduler`."""
+    def __init__(self, on_success: Optional[Callable] = None, on_error: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None, on_cancel: Optional[Callable] = None):
+        """
+        Callbacks are called on the Tk main loop.
+        :param on_success: Called with the task's result.
+        :param on_error: Called with the exception raised by the task.
+        :param on_progress: Called with (value, message) reported by the task.
+        :param on_cancel: Called without arguments when the task stopped after cancellation.
+        """
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.future: Optional[Future] = None
+        self.__cancelled = threading.Event()
+        self.__progress: queue.SimpleQueue = queue.SimpleQueue()
+
+    @property
+    def cancelled(self) -> bool:
+        """Checks if the job was cancelled."""
+        return self.__cancelled.is_set()
+
+    def cancel(self):
+        """Cancels the job. Running task stops at its next :meth:`check` call."""
+        self.__cancelled.set()
+
+        if self.future:
+            self.future.cancel()
+
+    def check(self):
+        """Raises :class:`JobCancelled` if the job was cancelled. Called by the task."""
+        if self.cancelled:
+            raise JobCancelled()
+
+    def report(self, value: float, message: str = ""):
+        """
+        Reports progress of the task. Called by the task from the worker thread.
+        :param value: Progress from 0 to 1.
+        :param message: Description of the current step.
+        """
+        self.__progress.put((value, message))
+
+    def progress_updates(self) -> list[tuple[float, str]]:
+        """Takes all progress reports not delivered yet."""
+        updates = []
+
+        while not self.__progress.empty():
+            updates.append(self.__progress.get())
+
+        return updates
+
+
+class JobScheduler:
+    """
+    Runs tasks on a thread or process pool and delivers their progress and results
+    to the Tk main loop by polling with `after()`.
+    """
+    POLL_INTERVAL: int = 50  # Milliseconds between checks of running jobs
+
+    def __init__(self, root: customtkinter.CTk, max_workers: Optional[int] = None):
+        """
+        :param root: Application's window, which main loop receives the results.
+        :param max_workers: Size of the thread and process pools. Defaults to the executors' defaults.
+        """
+        self.root = root
+        self.max_workers = max_workers
+        self.__threads = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.__processes: Optional[ProcessPoolExecutor] = None
+        self.__jobs: list[Job] = []
+        self.__poll_id: Optional[str] = None
+
+    def submit(self, task: Callable, *args, on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, on_progress: Optional[Callable] = None,
+               on_cancel: Optional[Callable] = None, progress: bool = False, process: bool = False) -> Job:
+        """
+        Runs task in the background.
+        :param task: Function to run. Must not touch Tk widgets.
+        :param args: Arguments of the task.
+        :param on_success: Called on the main loop with the task's result.
+        :param on_error: Called on the main loop with the exception raised by the task.
+        :param on_progress: Called on the main loop with (value, message) reported by the task.
+        :param on_cancel: Called on the main loop when the task stopped after cancellation.
+        :param progress: Passes :class:`Job` to the thread task as `job` keyword argument,
+            to report progress and check for cancellation.
+        :param process: Runs the task on the process pool. Task and arguments must be picklable,
+            progress is not available and running task can't be cancelled.
+        :return: :class:`Job` handle.
+        """
+        job = Job(on_success, on_error, on_progress, on_cancel)
+
+        if process:
+            job.future = self.__process_pool().submit(task, *args)
+        elif progress:
+            job.future = self.__threads.submit(task, *args, job=job)
+        else:
+            job.future = self.__threads.submit(task, *args)
+
+        self.__jobs.append(job)
+
+        if self.__poll_id is None:
+            self.__poll_id = self.root.after(self.POLL_INTERVAL, self.__poll)
+
+        return job
+
+    def shutdown(self, wait: bool = False):
+        """
+        Cancels all jobs and stops the pools.
+        :param wait: Wait until running tasks stop, e.g. before closing resources they use.
+        """
+        for job in self.__jobs:
+            job.cancel()
+
+        self.__jobs.clear()
+
+        if self.__poll_id is not None:
+            self.root.after_cancel(self.__poll_id)
+            self.__poll_id = None
+
+        self.__threads.shutdown(wait=wait, cancel_futures=True)
+
+        if self.__processes:
+            self.__processes.shutdown(wait=wait, cancel_futures=True)
+
+    def __process_pool(self) -> ProcessPoolExecutor:
+        """Gets process pool, starting it on first use."""
+        if self.__processes is None:
+            self.__processes = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        return self.__processes
+
+    def __poll(self):
+        """Delivers progress and results of the jobs, then schedules next check if any job is running."""
+        for job in list(self.__jobs):
+            if job.on_progress:
+                for value, message in job.progress_updates():
+                    job.on_progress(value, message)
+
+            if job.future.done():
+                self.__jobs.remove(job)
+                self.__finish(job)
+
+        self.__poll_id = self.root.after(self.POLL_INTERVAL, self.__poll) if self.__jobs else None
+
+    def __finish(self, job: Job):
+        """Calls the job's callback matching the task's outcome."""
+        try:
+            result: Any = job.future.result()
+        except (CancelledError, JobCancelled):
+            if job.on_cancel:
+                job.on_cancel()
+        except Exception as error:
+            if job.on_error:
+                job.on_error(error)
+            else:
+                self.root.report_callback_exception(type(error), error, error.__traceback__)
+        else:
+            if job.cancelled:
+                if job.on_cancel:
+                    job.on_cancel()
+            elif job.on_success:
+                job.on_success(result)
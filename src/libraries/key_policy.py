@@ -0,0 +1,133 @@
+import math
+import statistics
+import time
+from functools import lru_cache
+from typing import Dict
+from src.utils import helpers
+
+
+class KeyPolicy:
+    """
+    Chooses algorithms and costs of password hashes and key derivation.
+    Costs are calibrated on the current machine to take about `target_ms` each,
+    but never drop below MINIMUM_COSTS. Existing hashes and keys are upgraded only when their work
+    is below UPGRADE_MARGIN of the calibrated one, so calibration noise doesn't trigger upgrades.
+    """
+    PASSWORD_HASHES: tuple = ("bcrypt", "scrypt")
+    KEY_DERIVATIONS: tuple = ("pbkdf2_sha256", "scrypt")
+    MINIMUM_COSTS: Dict[str, int] = {
+        "bcrypt": helpers.BCRYPT_ROUNDS,
+        "scrypt": helpers.SCRYPT_COST,
+        "pbkdf2_sha256": helpers.PBKDF2_ITERATIONS
+    }
+    MAXIMUM_COSTS: Dict[str, int] = {
+        "bcrypt": 16,
+        "scrypt": 2 ** 17,  # 128 MiB of memory
+        "pbkdf2_sha256": 10000000
+    }
+    # Cheap costs measured to extrapolate the calibrated ones
+    PROBE_COSTS: Dict[str, int] = {
+        "bcrypt": 8,
+        "scrypt": 2 ** 10,
+        "pbkdf2_sha256": 20000
+    }
+    PROBE_RUNS: int = 5  # Probe measurements, their median is extrapolated
+    PBKDF2_STEP: int = 10000  # Calibrated PBKDF2 iterations are rounded down to multiple of the step
+    UPGRADE_MARGIN: float = 0.75  # Share of the calibrated work below which hashes and keys are upgraded
+
+    hash_algorithm: str = "bcrypt"
+    kdf_algorithm: str = "pbkdf2_sha256"
+    target_ms: int = 250
+
+    @classmethod
+    def configure(cls, hash_algorithm: str, kdf_algorithm: str, target_ms: int):
+        """
+        Sets the policy applied to new hashes and keys.
+        :param hash_algorithm: Password hash - one of PASSWORD_HASHES.
+        :param kdf_algorithm: Key derivation - one of KEY_DERIVATIONS.
+        :param target_ms: Time a single hash or key derivation should take.
+        """
+        if hash_algorithm not in cls.PASSWORD_HASHES:
+            raise KeyError(hash_algorithm)
+
+        if kdf_algorithm not in cls.KEY_DERIVATIONS:
+            raise KeyError(kdf_algorithm)
+
+        cls.hash_algorithm = hash_algorithm
+        cls.kdf_algorithm = kdf_algorithm
+        cls.target_ms = target_ms
+
+    @classmethod
+    def hash_cost(cls) -> int:
+        """Gets cost of the password hash calibrated to the target time."""
+        return cls.calibrate(cls.hash_algorithm, cls.target_ms)
+
+    @classmethod
+    def kdf_cost(cls) -> int:
+        """Gets cost of the key derivation calibrated to the target time."""
+        return cls.calibrate(cls.kdf_algorithm, cls.target_ms)
+
+    @classmethod
+    def hash_password(cls, password: str) -> bytes:
+        """Hashes the password with the policy's algorithm and cost."""
+        return helpers.hash_password(password, cls.hash_algorithm, cls.hash_cost())
+
+    @classmethod
+    def derive_key(cls, password: str, salt: bytes) -> bytes:
+        """Derives key from the password with the policy's algorithm and cost."""
+        return helpers.get_key(password, salt, cls.kdf_algorithm, cls.kdf_cost())
+
+    @classmethod
+    def needs_rehash(cls, hashed_password: bytes) -> bool:
+        """Checks if the hash was made with other algorithm or lower cost than the policy's."""
+        algorithm, cost = helpers.password_hash_parameters(hashed_password)
+        return algorithm != cls.hash_algorithm or cls.__is_weaker(algorithm, cost, cls.hash_cost())
+
+    @classmethod
+    def needs_new_key(cls, algorithm: str, cost: int) -> bool:
+        """Checks if the key was derived with other algorithm or lower cost than the policy's."""
+        return algorithm != cls.kdf_algorithm or cls.__is_weaker(algorithm, cost, cls.kdf_cost())
+
+    @classmethod
+    def __is_weaker(cls, algorithm: str, cost: int, calibrated: int) -> bool:
+        """Checks if work of the cost is below UPGRADE_MARGIN of the calibrated cost's work."""
+        def work(value: int) -> int:
+            # bcrypt's cost is log2 of rounds
+            return 2 ** value if algorithm == "bcrypt" else value
+
+        return work(cost) < cls.UPGRADE_MARGIN * work(calibrated)
+
+    @staticmethod
+    @lru_cache
+    def calibrate(algorithm: str, target_ms: int) -> int:
+        """
+        Measures the algorithm at its probe cost PROBE_RUNS times and extrapolates cost taking `target_ms`
+        from the median. Memoized, so the machine is measured once per algorithm and target.
+        :param algorithm: One of PASSWORD_HASHES or KEY_DERIVATIONS.
+        :param target_ms: Time a single hash or key derivation should take.
+        :return: bcrypt's log2 rounds, scrypt's N or PBKDF2 iterations.
+        """
+        probe = KeyPolicy.PROBE_COSTS[algorithm]
+        timings = []
+
+        for _ in range(KeyPolicy.PROBE_RUNS):
+            start = time.perf_counter()
+
+            if algorithm == "bcrypt":
+                helpers.hash_password("calibration", algorithm, probe)
+            else:
+                helpers.get_key("calibration", bytes(16), algorithm, probe)
+
+            timings.append(time.perf_counter() - start)
+
+        ratio = target_ms / max(statistics.median(timings) * 1000, 0.001)
+
+        if algorithm == "bcrypt":
+            # Every round doubles the time
+            cost = probe + math.floor(math.log2(ratio))
+        elif algorithm == "scrypt":
+            cost = 2 ** math.floor(math.log2(probe * ratio))
+        else:
+            cost = probe * ratio // KeyPolicy.PBKDF2_STEP * KeyPolicy.PBKDF2_STEP
+
+        return int(min(max(cost, KeyPolicy.MINIMUM_COSTS[algorithm]), KeyPolicy.MAXIMUM_COSTS[algorithm]))
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class MigrationBase(ABC):
+    """
+    Base class for the database's schema migration.
+    :var version: schema version (PRAGMA user_version) the migration upgrades to
+    :var description: summary of the schema change
+    """
+    version: Optional[int] = None
+    description: Optional[str] = None
+
+    @classmethod
+    @abstractmethod
+    def up(cls, db):
+        """
+        Applies the migration. Runs inside a transaction together with the version update.
+        :param db: :class:`Database` class.
+        """
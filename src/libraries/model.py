@@ -1,3 +1,4 @@
+import re
 from sqlite3 import Row
 from typing import Optional, List
 from src.libraries.database import Database as Db
@@ -19,22 +20,7 @@ class Model:
         :param order: - `asc` (descending) or `desc` (descending).
         :return: List of Row objects or a Row object if the limit is set to 1.
         """
-        Db.select(cls.table, fields if fields else cls.table.selectable)
-
-        if cls.table.references:
-            Db.left_join(cls.table.references)
-
-        Db.order_by(f"{cls.table.name}.{order_by}")
-
-        if order.upper() == "ASC":
-            Db.asc()
-        elif order.upper() == "DESC":
-            Db.desc()
-
-        if limit:
-            Db.limit(limit)
-
-        return Db.get_one() if limit == 1 else Db.get()
+        return cls.__fetch(cls.__select(fields), limit, order_by, order)
 
     @classmethod
     def find_by_id(cls, __id, fields: Optional[dict | tuple] = None) -> Row:
@@ -44,8 +30,7 @@ class Model:
         :param fields: Columns to retrieve - :class:`TableBase`.selectable.
         :return: Row object.
         """
-        return (Db.select(cls.table, fields if fields else cls.table.selectable)
-                .where(condition=f"{cls.table.name}.id = ?", parameters=[__id,])).get_one()
+        return cls.__select(fields).where(condition=f"{cls.table.name}.id = ?", parameters=[__id,]).get_one()
 
     @classmethod
     def find_by(cls, condition: str, parameters: list, fields: Optional[dict | tuple] = None,
@@ -60,26 +45,13 @@ class Model:
         :param order: - `asc` (descending) or `desc` (descending).
         :return: list of Row objects or a Row object if the limit is set to 1.
         """
-        Db.select(cls.table, fields if fields else cls.table.selectable).where(condition, parameters)
-        if cls.table.references:
-            Db.left_join(cls.table.references)
-
-        Db.order_by(f"{cls.table.name}.{order_by}")
-
-        if order.upper() == "ASC":
-            Db.asc()
-        elif order.upper() == "DESC":
-            Db.desc()
-
-        if limit:
-            Db.limit(limit)
-
-        return Db.get_one() if limit == 1 else Db.get()
+        return cls.__fetch(cls.__select(fields).where(condition, parameters), limit, order_by, order)
 
     @classmethod
     def search(cls, item: str, search_in: list, additional_condition: Optional[str] = None,
                named_params: Optional[dict] = None, fields: Optional[dict | tuple] = None,
-               limit: Optional[int] = None, order_by: str = "id", order: str = "asc") -> List[Row] | Row:
+               limit: Optional[int] = None, order_by: str = "id", order: str = "asc",
+               full_text: bool = False) -> List[Row] | Row:
         """
         Fetches rows from the table where item matches values in defined table columns. Expected formats:
         :param item: - Search for.
@@ -90,33 +62,81 @@ class Model:
         :param limit: - Number of rows.
         :param order_by: - Table column.
         :param order: - `asc` (descending) or `desc` (descending).
+        :param full_text: Match prefixes of item's tokens using FTS5 shadow table instead of matching substrings.
+            Substrings are matched if the shadow table wasn't created (Database.search_index)
+            or not all `search_in` columns are in :class:`TableBase`.search_index.
         :return: list of Row objects or a Row object if the limit is set to 1.
         """
-        condition = (f"{search_in[0] if len(search_in) == 1 else f"{" || ', ' || ".join(search_in)}"}"
-                     f" LIKE :search")
+        match = cls.__match_expression(item, search_in) if full_text and cls.__has_search_index(search_in) else None
+
+        if match:
+            fts = f"{cls.table.name}_fts"
+            condition = f"{cls.table.name}.id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH :search)"
+        else:
+            condition = (f"{search_in[0] if len(search_in) == 1 else f"{" || ', ' || ".join(search_in)}"}"
+                         f" LIKE :search")
+
         condition = f"{f"{additional_condition} AND {condition}" if additional_condition else condition}"
+        search = match if match else f"%{item}%"
 
         if named_params:
-            named_params.update({"search": f"%{item}%"})
+            named_params.update({"search": search})
         else:
-            named_params = {"search": f"%{item}%"}
+            named_params = {"search": search}
 
-        Db.select(cls.table, fields if fields else cls.table.selectable).where(condition, named_params)
+        return cls.__fetch(cls.__select(fields).where(condition, named_params), limit, order_by, order)
 
-        if cls.table.references:
-            Db.left_join(cls.table.references)
+    @classmethod
+    def __select(cls, fields: Optional[dict | tuple] = None) -> Db:
+        """
+        Generates SELECT query joined with referenced tables.
+        :param fields: Columns to retrieve - :class:`TableBase`.selectable.
+        """
+        query = Db.select(cls.table, fields if fields else cls.table.selectable)
+        return query.left_join(cls.table.references) if cls.table.references else query
 
-        Db.order_by(f"{cls.table.name}.{order_by}")
+    @classmethod
+    def __fetch(cls, query: Db, limit: Optional[int], order_by: str, order: str) -> List[Row] | Row:
+        """
+        Orders, limits and executes SELECT query.
+        :param query: SELECT query.
+        :param limit: - Number of rows.
+        :param order_by: - Table column.
+        :param order: - `asc` (descending) or `desc` (descending).
+        :return: list of Row objects or a Row object if the limit is set to 1.
+        """
+        query = query.order_by(f"{cls.table.name}.{order_by}")
 
         if order.upper() == "ASC":
-            Db.asc()
+            query = query.asc()
         elif order.upper() == "DESC":
-            Db.desc()
+            query = query.desc()
 
         if limit:
-            Db.limit(limit)
+            query = query.limit(limit)
+
+        return query.get_one() if limit == 1 else query.get()
+
+    @classmethod
+    def __has_search_index(cls, columns: list) -> bool:
+        """Checks if all columns are indexed by the table's FTS5 shadow table."""
+        return bool(cls.table.search_index and set(columns) <= set(cls.table.search_index)
+                    and Db.table_exists(f"{cls.table.name}_fts"))
+
+    @staticmethod
+    def __match_expression(item: str, columns: list) -> Optional[str]:
+        """
+        Generates FTS5 MATCH expression where every token of `item` is matched as a prefix.
+        :param item: Search for.
+        :param columns: Columns to match in.
+        :return: MATCH expression or None if `item` has no tokens.
+        """
+        tokens = re.findall(r"\w+", item)
+
+        if not tokens:
+            return None
 
-        return Db.get_one() if limit == 1 else Db.get()
+        return f"{{{" ".join(columns)}}} : ({" ".join(f'"{token}"*' for token in tokens)})"
 
     @classmethod
     def create(cls, fields: tuple, values: list | tuple, ignore: bool = False) -> int:
@@ -129,6 +149,36 @@ class Model:
         """
         return Db.insert(cls.table, fields, values, ignore).run()
 
+    @classmethod
+    def create_returning(cls, fields: tuple, values: list | tuple, columns: tuple = ("*",),
+                         ignore: bool = False) -> List[Row]:
+        """
+        Creates the row/rows and fetches them in the same statement. Expected formats:
+        :param fields: Table columns - ("col1", "col2", ...).
+        :param values: List of rows or row- [(col1_value, col2_value, ...), ...] or (col1_value, col2_value)
+        :param columns: Columns of the created rows to return - ("col1", ...) or ("*",).
+            Uses RETURNING clause, or ids of the inserted rows on sqlite < 3.35.
+        :param ignore: Ignore if any constraint is violated.
+        :return: List of the created Row objects in the order of `values`, without rows ignored.
+        """
+        query = Db.insert(cls.table, fields, values, ignore)
+
+        if Db.RETURNING:
+            return query.returning(columns).run_returning()
+
+        selected = columns if "*" in columns or "id" in columns else ("id", *columns)
+
+        # The write lock is held, so the ids' range contains only the rows inserted here
+        with Db.transaction():
+            ids = query.run_lastrowids()
+            rows = {
+                row["id"]: row for row in Db.select(cls.table, selected).where(
+                    "id BETWEEN ? AND ?", [min(ids), max(ids)]
+                ).get()
+            } if ids else {}
+
+        return [rows[__id] for __id in ids]
+
     @classmethod
     def update(cls, __id: str | int, fields: dict) -> int:
         """
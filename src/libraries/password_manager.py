@@ -8,6 +8,8 @@ from typing import Dict
 from PIL import Image
 from src.utils import window
 from src.libraries.database import Database as Db
+from src.libraries.jobs import JobScheduler
+from src.libraries.key_policy import KeyPolicy
 from src.utils.helpers import center_window, SECOND, MINUTE, resource_path
 from src import style
 
@@ -16,6 +18,16 @@ class PasswordManager(customtkinter.CTk):
     """Password manager application's class."""
     LOCK_FILE = resource_path("app.lock")
     DB_PATH: str = resource_path("data\\password_manager.db")
+    DB_PROFILE: str = "safe"  # Name of PRAGMA settings profile from Database.PROFILES
+    DB_CACHED_STATEMENTS: int = 128  # Number of prepared statements kept by the connection
+    DB_SEARCH_INDEX: bool = False  # Keep FTS5 index of accounts for Model.search's full text mode
+    BACKUP_DIR: str = resource_path("data\\backups")
+    BACKUP_DELAY: int = MINUTE  # Time after start before the first database snapshot
+    BACKUP_INTERVAL: int | None = 60 * MINUTE  # Time between database snapshots, None disables backups
+    BACKUP_KEEP: int = 5  # Number of snapshots kept in BACKUP_DIR
+    HASH_ALGORITHM: str = "bcrypt"  # Password hash from KeyPolicy.PASSWORD_HASHES
+    KDF_ALGORITHM: str = "pbkdf2_sha256"  # Key derivation from KeyPolicy.KEY_DERIVATIONS
+    KDF_TARGET_MS: int = 250  # Time a single hash or key derivation should take on this machine
     HEIGHT: int = 700
     WIDTH: int = 1000
 
@@ -66,6 +78,7 @@ class PasswordManager(customtkinter.CTk):
         self.is_resizable: bool = False
         self.current_window: str | None = None
         self.windows: dict = {}
+        self.jobs: JobScheduler = JobScheduler(self)
         self.__setup()
 
         if PasswordManager.instance_is_running():
@@ -74,7 +87,9 @@ class PasswordManager(customtkinter.CTk):
 
     def __setup(self):
         """Setups the application."""
-        Db.create_connection(self.DB_PATH)
+        Db.create_connection(self.DB_PATH, self.DB_PROFILE, self.DB_CACHED_STATEMENTS, self.DB_SEARCH_INDEX)
+        KeyPolicy.configure(self.HASH_ALGORITHM, self.KDF_ALGORITHM, self.KDF_TARGET_MS)
+        self.schedule_backup(self.BACKUP_DELAY)
         self.load_windows(window.LOG_IN, window.SIGN_UP)
         self.iconbitmap(resource_path("icon.ico"))
         self.title("Password Manager")
@@ -201,19 +216,53 @@ class PasswordManager(customtkinter.CTk):
         """
         return "Helvetica", size, weight
 
-    @staticmethod
-    def save_file_dialog():
-        """Shows save file dialog."""
+    def save_file_dialog(self, filetypes: list[tuple[str, str]]) -> tuple[str, str] | None:
+        """
+        Shows save file dialog.
+        :param filetypes: File types to choose from - [("description", "*.suffix"), ...].
+        :return: Chosen path and description of the chosen file type or None if the dialog was cancelled.
+        """
+        file_type = customtkinter.StringVar(self, filetypes[0][0])
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".pdf",
             initialfile="passwords",
-            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-            title="Save PDF File"
+            filetypes=[*filetypes, ("All files", "*.*")],
+            typevariable=file_type,
+            title="Export Passwords"
+        )
+        return (file_path, file_type.get()) if file_path else None
+
+    def schedule_backup(self, delay: int | None = None):
+        """
+        Schedules the next database snapshot.
+        :param delay: Time until the snapshot, BACKUP_INTERVAL by default.
+        """
+        if self.BACKUP_INTERVAL:
+            self.after(delay or self.BACKUP_INTERVAL, self.__backup)
+
+    def __backup(self):
+        """
+        Writes database snapshot in the background, unless the database is unchanged since the last one,
+        and schedules the next one.
+        """
+        self.jobs.submit(
+            Db.backup, self.BACKUP_DIR, self.BACKUP_KEEP,
+            on_error=lambda _error: self.flash_message("Database backup failed.", "danger")
+        )
+        self.schedule_backup()
+
+    @staticmethod
+    def open_file_dialog():
+        """Shows open file dialog for CSV files to import."""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Import Passwords"
         )
         return file_path or None
 
     def __on_closing(self):
         """Operations before closing the application."""
+        # Running tasks may use the database
+        self.jobs.shutdown(wait=True)
         Db.close_connection()
         self.remove_lock_file()
         self.destroy()
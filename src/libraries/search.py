@@ -0,0 +1,45 @@
+from sqlite3 import Row
+
+
+class IncrementalSearch:
+    """
+    In-memory search over already loaded rows.
+    When a query extends the previous one, only the previous results are searched.
+    """
+    def __init__(self, rows: list[Row], column: str):
+        """
+        :param rows: Row objects to search in.
+        :param column: Column to match the query against.
+        """
+        self.rows = rows
+        self.column = column
+        self.__index: list[tuple[str, Row]] | None = None
+        self.__query: str = ""
+        self.__results: list[tuple[str, Row]] = []
+
+    def search(self, query: str) -> list[Row]:
+        """
+        Finds rows where column's value contains query (case-insensitive).
+        :param query: Search for.
+        :return: List of matching Row objects in original order.
+        """
+        needle = query.casefold()
+
+        if not needle:
+            self.__query = ""
+            return self.rows
+
+        if self.__index is None:
+            self.__index = [(f"{row[self.column]}".casefold(), row) for row in self.rows]
+            self.__query = ""
+
+        source = self.__results if self.__query and needle.startswith(self.__query) else self.__index
+        self.__results = [item for item in source if needle in item[0]]
+        self.__query = needle
+        return [row for _, row in self.__results]
+
+    def reset(self):
+        """Drops the index and previous results. Must be called when rows change."""
+        self.__index = None
+        self.__query = ""
+        self.__results = []
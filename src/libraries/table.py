@@ -9,8 +9,14 @@ class TableBase(ABC):
     :var columns: columns of the table
     :var references: foreign keys - (('foreign_key', 'reference_table', 'reference_column'), ...)
     :var selectable: columns to be selected - {"table_name": (column, ...), ...} or ("column", ...)
+    :var indexes: columns covered by indexes - (("column", ...), ...)
+    :var unique: columns covered by unique indexes - (("column", ...), ...)
+    :var search_index: columns indexed by FTS5 shadow table `{name}_fts` when it's enabled - ("column", ...)
     """
     name: Optional[str] = None
     columns: Optional[dict] = None
     references: Optional[tuple[tuple]] = None
     selectable: Dict[str, tuple] | tuple = ("*",)
+    indexes: Optional[tuple[tuple]] = None
+    unique: Optional[tuple[tuple]] = None
+    search_index: Optional[tuple] = None
@@ -0,0 +1,48 @@
+from sqlite3 import Row
+from src.libraries.database import Database as Db
+from src.models.models import Password
+from src.utils import helpers
+
+
+class Vault:
+    """Maintenance of the user's encrypted entries."""
+    ENCRYPTED_COLUMNS: tuple = ("username", "password")
+
+    @classmethod
+    def upgrade_envelopes(cls, user_id: int, key: bytes, salt: bytes) -> int:
+        """
+        Rewrites the user's entries stored in the legacy envelope format with the current one.
+        Legacy envelopes start with the user's salt. Entries changed meanwhile are left untouched.
+        :param user_id: Owner of the entries.
+        :param key: Key the entries are encrypted with.
+        :param salt: User's salt.
+        :return: Number of rewritten entries.
+        """
+        prefix = len(salt)
+        entries = Password.find_by(
+            f"user_id = ? AND (substr(username, 1, {prefix}) = ? OR substr(password, 1, {prefix}) = ?)",
+            [user_id, salt, salt]
+        )
+        return cls.__rewrite(entries, key) if entries else 0
+
+    @classmethod
+    def __rewrite(cls, entries: list[Row], key: bytes) -> int:
+        """
+        Decrypts entries' fields and stores them in the current envelope format in a single transaction.
+        Rows which fields changed since they were read are skipped.
+        :return: Number of rewritten entries.
+        """
+        columns = cls.ENCRYPTED_COLUMNS
+        values = helpers.decrypt_many([entry[column] for entry in entries for column in columns], key)
+        values = helpers.encrypt_many(values, key)
+        condition = " AND ".join(("id = ?", *(f"{column} = ?" for column in columns)))
+        rewritten = 0
+
+        with Db.transaction():
+            for i, entry in enumerate(entries):
+                fields = dict(zip(columns, values[i * len(columns):(i + 1) * len(columns)]))
+                rewritten += Db.update(Password.table, fields).where(
+                    condition, [entry["id"], *(entry[column] for column in columns)]
+                ).run()
+
+        return rewritten
@@ -1,17 +1,22 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from src.libraries.table import TableBase
 
+STATEMENT_CACHE_SIZE = 256
 
-@dataclass
+
+@dataclass(frozen=True)
 class Query:
     """
     Return object for QueryBuilderMixin.build().
     :var statement: Sqlite query.
     :var parameters: Values for query parameters.
+    :var many: Parameters are list of rows to be executed with executemany.
     """
     statement: str
     parameters: Optional[list | tuple | dict]
+    many: bool = False
 
 
 class DataType:
@@ -73,13 +78,25 @@ class DataType:
 class QueryBuilderMixin:
     """
     Class for generating sqlite queries.
-    :var __statement: Query statement.
-    :var __table: Name of a table.
-    :var __parameters: Values for query parameters.
+    Query object is immutable: generating methods return a new query object, so queries can be
+    composed and executed concurrently from multiple threads.
+    Query is recorded as its shape: clauses and their arguments, without parameters values.
+    Statement text is generated once per shape and memoized.
     """
-    __statement: Optional[str] = None
-    __table: Optional[str] = None
-    __parameters: list | dict = []
+    __slots__ = ("__shape", "__table", "__parameters", "__many")
+
+    def __init__(self, shape: tuple = (), table: Optional[str] = None,
+                 parameters: tuple | list | dict = (), many: bool = False):
+        """
+        :param shape: Clauses of the query - ((clause_generator, argument, ...), ...).
+        :param table: Name of a table.
+        :param parameters: Values for query parameters.
+        :param many: Parameters are list of rows to be executed with executemany.
+        """
+        self.__shape = shape
+        self.__table = table
+        self.__parameters = parameters
+        self.__many = many
 
     @classmethod
     def create_table(cls, table: type[TableBase]):
@@ -87,16 +104,58 @@ class QueryBuilderMixin:
         Generates CREATE TABLE query.
         :param table: Table model(:class:`TableBase`) object.
         """
-        create_table = f"CREATE TABLE IF NOT EXISTS {table.name} ("
+        references = tuple(tuple(reference) for reference in table.references) if table.references else ()
+        return cls(((cls.__create_table_clause, table.name, tuple(table.columns.items()), references),))
+
+    @classmethod
+    def create_index(cls, table: type[TableBase] | str, columns: tuple, unique: bool = False):
+        """
+        Generates CREATE INDEX query. Index is named `{table}_{column}_..._idx`.
+        :param table: Table model(:class:`TableBase`) object or table name.
+        :param columns: Columns covered by the index - ("col", ...).
+        :param unique: Create UNIQUE index.
+        """
+        return cls(((cls.__create_index_clause, cls.__name(table), tuple(columns), unique),))
+
+    @classmethod
+    def add_column(cls, table: type[TableBase] | str, column: str, definition: str):
+        """
+        Generates ALTER TABLE ... ADD COLUMN query.
+        :param table: Table model(:class:`TableBase`) object or table name.
+        :param column: Name of the new column.
+        :param definition: Column's type and constraints - :class:`DataType` value.
+        """
+        return cls(((cls.__add_column_clause, cls.__name(table), column, definition),))
 
-        for field, parameters in table.columns.items():
-            create_table += f"{field} {parameters}, "
+    @classmethod
+    def create_virtual_table(cls, name: str, module: str, arguments: tuple):
+        """
+        Generates CREATE VIRTUAL TABLE query.
+        :param name: Name of the virtual table.
+        :param module: Module implementing the table - "fts5", ...
+        :param arguments: Module arguments - ("column", "option='value'", ...).
+        """
+        return cls(((cls.__create_virtual_table_clause, name, module, tuple(arguments)),))
 
-        if table.references:
-            for reference in table.references:
-                create_table += f"FOREIGN KEY ({reference[0]}) REFERENCES {reference[1]}({reference[2]}), "
-        cls.__statement = create_table.rstrip(", ") + ")"
-        return cls()
+    @classmethod
+    def create_trigger(cls, name: str, event: str, table: type[TableBase] | str, body: tuple):
+        """
+        Generates CREATE TRIGGER query.
+        :param name: Name of the trigger.
+        :param event: When trigger fires - "AFTER INSERT", "AFTER UPDATE OF col", ...
+        :param table: Table model(:class:`TableBase`) object or table name.
+        :param body: Statements to execute - ("statement", ...).
+        """
+        return cls(((cls.__create_trigger_clause, name, event, cls.__name(table), tuple(body)),))
+
+    @classmethod
+    def pragma(cls, name: str, value: Optional[str | int] = None):
+        """
+        Generates PRAGMA statement.
+        :param name: Name of the pragma.
+        :param value: Value to set or None to query current value.
+        """
+        return cls(((cls.__pragma_clause, name, value),))
 
     @classmethod
     def select(cls, __from: type[TableBase] | str, fields: dict | tuple):
@@ -105,19 +164,14 @@ class QueryBuilderMixin:
         :param __from: Table model(:class:`TableBase`) object or table name.
         :param fields: The fields(:class:`TableBase`.selectable) to include in the SELECT query.
         """
-        select = "SELECT "
-        cls.__table = __from if isinstance(__from, str) else __from.name
+        table = cls.__name(__from)
 
         if isinstance(fields, dict):
-            for table, columns in fields.items():
-                for column in columns:
-                    select += f"{table}.{column}, "
+            columns = tuple((name, tuple(names)) for name, names in fields.items())
         else:
-            for column in fields:
-                select += f"{cls.__table}.{column}, "
+            columns = ((table, tuple(fields)),)
 
-        cls.__statement = f"{select.rstrip(", ")} FROM {cls.__table}"
-        return cls()
+        return cls(((cls.__select_clause, table, columns),), table)
 
     @classmethod
     def insert(cls, table: type[TableBase] | str, fields: tuple,  values: list | tuple, ignore: bool = False):
@@ -128,15 +182,13 @@ class QueryBuilderMixin:
         :param values: Values to insert [(value, ...), ...] or (value, ...).
         :param ignore: Ignore if any constraint is violated.
         """
-        vals = f"{tuple(['?' for _ in fields])}".replace("'", "")
-        cols = str(fields).replace("'", "")
-        cls.__statement = (
-            f"INSERT {"OR IGNORE " if ignore else ""}"
-            f"INTO {table if isinstance(table, str) else table.name} {cols}"
-            f" VALUES {vals}"
+        many = isinstance(values, list) and bool(values) and isinstance(values[0], tuple | list)
+        return cls(
+            ((cls.__insert_clause, cls.__name(table), tuple(fields), ignore),),
+            cls.__name(table),
+            values if many else tuple(values),
+            many
         )
-        cls.__parameters = values
-        return cls()
 
     @classmethod
     def update(cls, table: type[TableBase] | str, fields: dict):
@@ -145,14 +197,11 @@ class QueryBuilderMixin:
         :param table: Table model(:class:`TableBase`) object or table name.
         :param fields: Columns and values to update - {"col": value, ...}.
         """
-        update = f"UPDATE {table if isinstance(table, str) else table.name} SET "
-
-        for column in fields.keys():
-            update += f"{column} = ?, "
-
-        cls.__statement = f"{update.rstrip(", ")}"
-        cls.__parameters = list(fields.values())
-        return cls()
+        return cls(
+            ((cls.__update_clause, cls.__name(table), tuple(fields.keys())),),
+            cls.__name(table),
+            tuple(fields.values())
+        )
 
     @classmethod
     def delete(cls, __from: type[TableBase] | str):
@@ -160,96 +209,174 @@ class QueryBuilderMixin:
         Generates DELETE query.
         :param __from: Table model(:class:`TableBase`) object or table name.
         """
-        cls.__statement = f"DELETE FROM {__from if isinstance(__from, str) else __from.name}"
-        return cls()
+        return cls(((cls.__delete_clause, cls.__name(__from)),), cls.__name(__from))
 
-    @classmethod
-    def inner_join(cls, references: tuple[tuple]):
+    def inner_join(self, references: tuple[tuple]):
         """
         Generates INNER_JOIN statement.
         :param references: Foreign keys - :class:`TableBase`.references.
         """
-        for reference in references:
-            cls.__statement += (
-                f" INNER JOIN {reference[1]} "
-                f"ON {cls.__table}.{reference[2]} = {reference[1]}.{reference[0]}"
-            )
-        return cls()
+        return self.__extend((self.__join_clause, "INNER", self.__table, tuple(tuple(ref) for ref in references)))
 
-    @classmethod
-    def left_join(cls, references: tuple[tuple]):
+    def left_join(self, references: tuple[tuple]):
         """
         Generates LEF_JOIN statement.
         :param references: Foreign keys - :class:`TableBase`.references.
         """
-        for reference in references:
-            cls.__statement += (
-                f" LEFT JOIN {reference[1]} "
-                f"ON {cls.__table}.{reference[2]} = {reference[1]}.{reference[0]}"
-            )
-        return cls()
+        return self.__extend((self.__join_clause, "LEFT", self.__table, tuple(tuple(ref) for ref in references)))
 
-    @classmethod
-    def where(cls, condition: str, parameters: list | dict):
+    def where(self, condition: str, parameters: list | dict):
         """
         Generates WHERE statement.
         :param condition: Sqlite WHERE condition.
         :param parameters: Query parameters values.
         """
-        cls.__statement += f" WHERE {condition}"
-
         if isinstance(parameters, list):
-            cls.__parameters += parameters
-        else:
-            cls.__parameters = parameters
-        return cls()
+            parameters = tuple(self.__parameters) + tuple(parameters)
 
-    @classmethod
-    def order_by(cls, column: str):
+        return self.__extend((self.__where_clause, condition), parameters)
+
+    def returning(self, fields: tuple):
+        """
+        Generates RETURNING statement, requires sqlite 3.35+.
+        :param fields: Columns of the written rows to return - ("col", ...) or ("*",).
+        """
+        return self.__extend((self.__returning_clause, tuple(fields)))
+
+    def order_by(self, column: str):
         """
         Generates ORDER BY statement.
         :param column: Column to order by.
         """
-        cls.__statement += f" ORDER BY {column}"
-        return cls()
+        return self.__extend((self.__order_by_clause, column))
 
-    @classmethod
-    def asc(cls):
+    def asc(self):
         """Generates ASC statement."""
-        cls.__statement += " ASC"
-        return cls()
+        return self.__extend((self.__keyword_clause, "ASC"))
 
-    @classmethod
-    def desc(cls):
+    def desc(self):
         """Generates DESC statement."""
-        cls.__statement += " DESC"
-        return cls()
+        return self.__extend((self.__keyword_clause, "DESC"))
 
-    @classmethod
-    def limit(cls, __to: int, __from: int = 0):
+    def limit(self, __to: int, __from: int = 0):
         """
         Generates LIMIT statement.
         :param __to: Limit of rows to fetch or fetch up to a `number` of rows if `__from` is set.
         :param __from: Number of row to fetch from.
         """
-        cls.__statement += f" LIMIT {__to if not __from else f"{__from}, {__to}"}"
-        return cls()
+        return self.__extend((self.__limit_clause, __to, __from))
 
-    @classmethod
-    def build(cls):
+    def build(self) -> Query:
         """
         Builds sqlite query.
         :return: :class:`Query`.
         """
-        list_of_tuples = any(isinstance(item, tuple) for item in cls.__parameters)
-        statement = cls.__statement.strip()
-        parameters = cls.__parameters if list_of_tuples or isinstance(cls.__parameters, dict) \
-            else tuple(cls.__parameters)
-        cls.reset_query()
-        return Query(statement=statement, parameters=parameters)
+        return Query(statement=self.statement(self.__shape), parameters=self.__parameters, many=self.__many)
 
-    @classmethod
-    def reset_query(cls):
-        """Resets all attributes."""
-        cls.__statement = cls.__table = None
-        cls.__parameters = []
+    def __extend(self, clause: tuple, parameters: Optional[tuple | dict] = None):
+        """
+        Creates copy of the query with appended clause.
+        :param clause: (clause_generator, argument, ...).
+        :param parameters: Replaces query parameters values if set.
+        """
+        return type(self)(
+            self.__shape + (clause,),
+            self.__table,
+            self.__parameters if parameters is None else parameters,
+            self.__many
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+    def statement(shape: tuple) -> str:
+        """
+        Generates statement text of the query's shape. Memoized per shape.
+        :param shape: Clauses of the query - ((clause_generator, argument, ...), ...).
+        """
+        return "".join(clause(*arguments) for clause, *arguments in shape)
+
+    @staticmethod
+    def __name(table: type[TableBase] | str) -> str:
+        """Gets the table's name."""
+        return table if isinstance(table, str) else table.name
+
+    @staticmethod
+    def __create_table_clause(name: str, columns: tuple, references: tuple) -> str:
+        definitions = [f"{field} {parameters}" for field, parameters in columns]
+        definitions += [
+            f"FOREIGN KEY ({reference[0]}) REFERENCES {reference[1]}({reference[2]})" for reference in references
+        ]
+        return f"CREATE TABLE IF NOT EXISTS {name} ({", ".join(definitions)})"
+
+    @staticmethod
+    def __create_index_clause(name: str, columns: tuple, unique: bool) -> str:
+        return (
+            f"CREATE {"UNIQUE " if unique else ""}INDEX IF NOT EXISTS {name}_{"_".join(columns)}_idx "
+            f"ON {name} ({", ".join(columns)})"
+        )
+
+    @staticmethod
+    def __add_column_clause(table: str, column: str, definition: str) -> str:
+        return f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+
+    @staticmethod
+    def __create_virtual_table_clause(name: str, module: str, arguments: tuple) -> str:
+        return f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING {module}({", ".join(arguments)})"
+
+    @staticmethod
+    def __create_trigger_clause(name: str, event: str, table: str, body: tuple) -> str:
+        return (
+            f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table} "
+            f"BEGIN {" ".join(f"{statement};" for statement in body)} END"
+        )
+
+    @staticmethod
+    def __pragma_clause(name: str, value: Optional[str | int]) -> str:
+        return f"PRAGMA {name}{f" = {value}" if value is not None else ""}"
+
+    @staticmethod
+    def __select_clause(table: str, columns: tuple) -> str:
+        return f"SELECT {", ".join(f"{name}.{column}" for name, names in columns for column in names)} FROM {table}"
+
+    @staticmethod
+    def __insert_clause(table: str, fields: tuple, ignore: bool) -> str:
+        return (
+            f"INSERT {"OR IGNORE " if ignore else ""}"
+            f"INTO {table} ({", ".join(fields)})"
+            f" VALUES ({", ".join("?" for _ in fields)})"
+        )
+
+    @staticmethod
+    def __update_clause(table: str, columns: tuple) -> str:
+        return f"UPDATE {table} SET {", ".join(f"{column} = ?" for column in columns)}"
+
+    @staticmethod
+    def __delete_clause(table: str) -> str:
+        return f"DELETE FROM {table}"
+
+    @staticmethod
+    def __join_clause(kind: str, table: str, references: tuple) -> str:
+        return "".join(
+            f" {kind} JOIN {reference[1]} ON {table}.{reference[2]} = {reference[1]}.{reference[0]}"
+            for reference in references
+        )
+
+    @staticmethod
+    def __where_clause(condition: str) -> str:
+        return f" WHERE {condition}"
+
+    @staticmethod
+    def __returning_clause(fields: tuple) -> str:
+        return f" RETURNING {", ".join(fields)}"
+
+    @staticmethod
+    def __order_by_clause(column: str) -> str:
+        return f" ORDER BY {column}"
+
+    @staticmethod
+    def __keyword_clause(keyword: str) -> str:
+        return f" {keyword}"
+
+    @staticmethod
+    def __limit_clause(__to: int, __from: int) -> str:
+        return f" LIMIT {__to if not __from else f"{__from}, {__to}"}"
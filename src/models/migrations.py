@@ -0,0 +1,34 @@
+from src.libraries.migration import MigrationBase
+from src.models import tables
+
+
+class CreateTables(MigrationBase):
+    """Initial schema."""
+    version = 1
+    description = "Create tables and indexes defined in src.models.tables"
+
+    @classmethod
+    def up(cls, db):
+        db.create_tables()
+
+
+class AddKeyDerivationColumns(MigrationBase):
+    """Per-user key derivation parameters."""
+    version = 2
+    description = "Add kdf_algorithm and kdf_cost columns to users, existing keys were derived with PBKDF2"
+
+    @classmethod
+    def up(cls, db):
+        db.ensure_column(tables.Users, "kdf_algorithm")
+        db.ensure_column(tables.Users, "kdf_cost")
+
+
+class AddWrappedKeyColumn(MigrationBase):
+    """Data key wrapped by the key derived from user's key."""
+    version = 3
+    description = "Add wrapped_key column to users, keys of existing users are wrapped on their next log in"
+
+    @classmethod
+    def up(cls, db):
+        db.ensure_column(tables.Users, "wrapped_key")
+
@@ -1,4 +1,3 @@
-from sqlite3 import Row
 from src.libraries.model import Model
 from src.models import tables
 
@@ -11,7 +10,3 @@ class User(Model):
 class Password(Model):
     """Model to interact with `passwords` table in database."""
     table = tables.Passwords
-
-    @classmethod
-    def find_latest(cls) -> Row:
-        return cls.find(limit=1, order_by="id", order="DESC")
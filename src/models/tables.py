@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from src import style
 from src.mixins.query_builder_mixin import DataType
 from src.libraries.table import TableBase
-from src.utils.helpers import SECOND
+from src.utils.helpers import SECOND, PBKDF2_ITERATIONS
 
 
 @dataclass
@@ -18,8 +18,12 @@ class Users(TableBase):
         "salt": DataType.blob(null=False),
         "theme_color": DataType.text(null=False, default=style.TURQUOISE),
         "color_mode": DataType.text(null=False, default=style.LIGHT),
-        "lock_timer": DataType.integer(default=30 * SECOND)
+        "lock_timer": DataType.integer(default=30 * SECOND),
+        "kdf_algorithm": DataType.text(null=False, default="'pbkdf2_sha256'"),
+        "kdf_cost": DataType.integer(null=False, default=PBKDF2_ITERATIONS),
+        "wrapped_key": DataType.blob()
     }
+    unique = (("email",),)
 
 
 @dataclass
@@ -33,3 +37,5 @@ class Passwords(TableBase):
         "username": DataType.blob(null=False),
         "password": DataType.blob(null=False)
     }
+    indexes = (("user_id", "id"),)
+    search_index = ("account",)
@@ -0,0 +1,167 @@
+"""
+Micro-benchmarks of hashing and encryption helpers.
+
+Usage: python -m src.utils.benchmark [--output benchmark.json] [--seconds 1.0] [--baseline old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Optional
+from src.utils import helpers
+
+PAYLOAD_SIZES = (16, 256, 4096, 65536)  # Bytes of encrypted strings
+BATCH_SIZES = (100, 1000, 10000)  # Values per encrypt_many/decrypt_many call
+MIN_RUNS = 5
+
+
+@dataclass
+class Result:
+    """
+    Measurements of a single benchmark case.
+    :var name: Benchmarked function.
+    :var parameters: Parameters of the case - algorithm, payload size, batch size, ...
+    :var runs: Number of timed calls.
+    :var ops_per_sec: Operations per second, batch calls count every value as an operation.
+    :var p50_ms: Median latency of a call.
+    :var p99_ms: 99th percentile latency of a call.
+    """
+    name: str
+    parameters: dict = field(default_factory=dict)
+    runs: int = 0
+    ops_per_sec: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+
+    @property
+    def case(self) -> str:
+        """Identifies the case across result files."""
+        return f"{self.name}({", ".join(f"{key}={value}" for key, value in self.parameters.items())})"
+
+
+def measure(name: str, call: Callable[[], object], seconds: float, ops: int = 1, **parameters) -> Result:
+    """
+    Calls function repeatedly for at least `seconds` and MIN_RUNS times.
+    :param name: Benchmarked function.
+    :param call: Function to time.
+    :param seconds: Time budget of the case.
+    :param ops: Operations performed by a single call.
+    :param parameters: Parameters of the case.
+    """
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    while len(latencies) < MIN_RUNS or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return Result(
+        name=name,
+        parameters=parameters,
+        runs=len(latencies),
+        ops_per_sec=round(ops * len(latencies) / sum(latencies), 2),
+        p50_ms=round(percentile(latencies, 50) * 1000, 4),
+        p99_ms=round(percentile(latencies, 99) * 1000, 4)
+    )
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Gets the nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))]
+
+
+def run(seconds: float) -> list[Result]:
+    """
+    Runs all benchmark cases.
+    :param seconds: Time budget of every case.
+    """
+    key = os.urandom(32)
+    salt = os.urandom(16)
+    results = []
+
+    for algorithm, cost in (("bcrypt", helpers.BCRYPT_ROUNDS), ("scrypt", helpers.SCRYPT_COST)):
+        hashed = helpers.hash_password("benchmark", algorithm, cost)
+        results.append(measure("hash_password", lambda: helpers.hash_password("benchmark", algorithm, cost),
+                               seconds, algorithm=algorithm, cost=cost))
+        results.append(measure("verify_password", lambda: helpers.verify_password(hashed, "benchmark"),
+                               seconds, algorithm=algorithm, cost=cost))
+
+    for algorithm, cost in (("pbkdf2_sha256", helpers.PBKDF2_ITERATIONS), ("scrypt", helpers.SCRYPT_COST)):
+        results.append(measure("get_key", lambda: helpers.get_key("benchmark", salt, algorithm, cost),
+                               seconds, algorithm=algorithm, cost=cost))
+
+    for size in PAYLOAD_SIZES:
+        data = "x" * size
+        encrypted = helpers.encrypt_data(data, key)
+        results.append(measure("encrypt_data", lambda: helpers.encrypt_data(data, key), seconds, payload=size))
+        results.append(measure("decrypt_data", lambda: helpers.decrypt_data(encrypted, key), seconds, payload=size))
+
+    for size in BATCH_SIZES:
+        values = ["x" * 32] * size
+        encrypted = helpers.encrypt_many(values, key)
+        results.append(measure("encrypt_many", lambda: helpers.encrypt_many(values, key),
+                               seconds, size, payload=32, batch=size))
+        results.append(measure("decrypt_many", lambda: helpers.decrypt_many(encrypted, key),
+                               seconds, size, payload=32, batch=size))
+
+    results.append(measure("generate_password", helpers.generate_password, seconds))
+    return results
+
+
+def compare(results: list[Result], baseline: list[dict]) -> dict[str, float]:
+    """
+    Compares throughput with baseline results.
+    :return: Relative change of ops/sec by case - {"case": 0.12, ...}.
+    """
+    previous = {Result(**item).case: item["ops_per_sec"] for item in baseline}
+    return {
+        result.case: round(result.ops_per_sec / previous[result.case] - 1, 4)
+        for result in results if previous.get(result.case)
+    }
+
+
+def main(argv: Optional[list[str]] = None):
+    """Runs the benchmarks, prints a table and writes results as JSON."""
+    parser = argparse.ArgumentParser(prog="python -m src.utils.benchmark", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark.json", help="JSON file to write results to")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time budget of every case")
+    parser.add_argument("--baseline", help="JSON file of previous results to compare ops/sec with")
+    args = parser.parse_args(argv)
+
+    results = run(args.seconds)
+    changes = {}
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            changes = compare(results, json.load(file)["results"])
+
+    print(f"{"case":<58}{"runs":>8}{"ops/sec":>14}{"p50 ms":>12}{"p99 ms":>12}{"change":>10}")
+
+    for result in results:
+        change = f"{changes[result.case]:+.1%}" if result.case in changes else ""
+        print(f"{result.case:<58}{result.runs:>8}{result.ops_per_sec:>14.2f}"
+              f"{result.p50_ms:>12.4f}{result.p99_ms:>12.4f}{change:>10}")
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump({
+            "machine": {
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "python": sys.version.split()[0]
+            },
+            "seconds": args.seconds,
+            "results": [asdict(result) for result in results],
+            "changes": changes
+        }, file, indent=2)
+
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 """Helper functions and constants."""
+import base64
 import hashlib
+import hmac
 import random
 import re
 import sys
@@ -7,18 +9,29 @@ import bcrypt
 import customtkinter
 import colorsys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Iterable, Callable
 from Crypto.Cipher import AES
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.pdfencrypt import StandardEncryption
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.platypus import Table, TableStyle, Paragraph
 
 SECOND = 1000
 MINUTE = 60000
 
+BCRYPT_ROUNDS = 12  # bcrypt's default cost (log2 of rounds)
+PBKDF2_ITERATIONS = 100000
+SCRYPT_COST = 2 ** 14  # CPU/memory cost (N), power of 2
+SCRYPT_BLOCK_SIZE = 8  # r
+SCRYPT_PARALLELISM = 1  # p
+SCRYPT_PREFIX = b"$scrypt$"
+
+ENVELOPE_VERSION = 1  # First byte of encrypted values: version + 12-byte nonce + 16-byte tag + ciphertext
+ENVELOPE_NONCE_SIZE = 12
+ENVELOPE_TAG_SIZE = 16
+LEGACY_ENVELOPE_HEADER_SIZE = 48  # Encrypted values before versioning: salt + 16-byte nonce + tag + ciphertext
+
+CRYPTO_BATCH_SIZE = 256  # Values encrypted/decrypted by a single worker task
+CRYPTO_PARALLEL_THRESHOLD = 1024  # Smaller batches are processed on the calling thread
+
 
 def resource_path(relative_path):
     """https://stackoverflow.com/questions/31836104/pyinstaller-and-onefile-how-to-include-an-image-in-the-exe-file"""
@@ -47,16 +60,55 @@ def regexp(expr, item):
     return reg.search(item) is not None
 
 
-def hash_password(password: str) -> bytes:
-    """Hash the password with the salt."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+def hash_password(password: str, algorithm: str = "bcrypt", cost: Optional[int] = None) -> bytes:
+    """
+    Hash the password with a random salt. The hash records the algorithm, cost and salt.
+    :param password: Password to hash.
+    :param algorithm: "bcrypt" or "scrypt".
+    :param cost: bcrypt's log2 rounds or scrypt's N. Algorithm's default if not set.
+    """
+    if algorithm == "scrypt":
+        cost = cost or SCRYPT_COST
+        salt = os.urandom(16)
+        digest = scrypt(password, salt, cost)
+        return SCRYPT_PREFIX + b"$".join((str(cost).encode(), base64.b64encode(salt), base64.b64encode(digest)))
+
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(cost or BCRYPT_ROUNDS))
 
 
 def verify_password(hashed_password: bytes, provided_password: str) -> bool:
     """Verify the provided password against the hashed password."""
+    if hashed_password.startswith(SCRYPT_PREFIX):
+        cost, salt, digest = hashed_password[len(SCRYPT_PREFIX):].split(b"$")
+        provided = scrypt(provided_password, base64.b64decode(salt), int(cost))
+        return hmac.compare_digest(provided, base64.b64decode(digest))
+
     return bcrypt.checkpw(provided_password.encode(), hashed_password)
 
 
+def password_hash_parameters(hashed_password: bytes) -> tuple[str, int]:
+    """
+    Gets algorithm and cost the password was hashed with.
+    :return: ("bcrypt", log2 rounds) or ("scrypt", N).
+    """
+    if hashed_password.startswith(SCRYPT_PREFIX):
+        return "scrypt", int(hashed_password[len(SCRYPT_PREFIX):].split(b"$")[0])
+
+    # $2b$<rounds>$<salt and hash>
+    return "bcrypt", int(hashed_password.split(b"$")[2])
+
+
+def scrypt(password: str, salt: bytes, cost: int) -> bytes:
+    """
+    Derive 32 bytes from the password with scrypt.
+    :param cost: CPU/memory cost (N), power of 2.
+    """
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=cost, r=SCRYPT_BLOCK_SIZE, p=SCRYPT_PARALLELISM,
+        maxmem=256 * SCRYPT_BLOCK_SIZE * cost, dklen=32
+    )
+
+
 def center_window(root: customtkinter.CTk, width: int, height: int):
     """
     Centers :class:`customtkinter.CTk` application's window on the screen.
@@ -100,34 +152,118 @@ def adjust_brightness(hex_color: str, factor: float | int = .9) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
-def get_key(password: str, salt: bytes) -> bytes:
-    """Derive a key from the password."""
-    key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 100000)
+def get_key(password: str, salt: bytes, algorithm: str = "pbkdf2_sha256", cost: int = PBKDF2_ITERATIONS) -> bytes:
+    """
+    Derive a key from the password.
+    :param algorithm: "pbkdf2_sha256" or "scrypt".
+    :param cost: PBKDF2 iterations or scrypt's N.
+    """
+    if algorithm == "scrypt":
+        return scrypt(password, salt, cost)
+
+    key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, cost)
     return key
 
 
-def encrypt_data(data: str, key_salt: tuple[bytes, bytes]) -> bytes:
-    """Encrypt the provided string data using the provided password."""
-    key, salt = key_salt
-    cipher = AES.new(key, AES.MODE_GCM)
-    ciphertext, tag = cipher.encrypt_and_digest(data.encode())
+def encrypt_data(data: str, key: bytes) -> bytes:
+    """
+    Encrypt the provided string data using the provided key.
+    :return: Envelope - version byte, nonce, tag and ciphertext.
+    """
+    return encrypt_bytes(data.encode(), key)
+
 
-    # Combine salt, nonce, tag, and ciphertext, then encode with base64
-    encrypted_data = salt + cipher.nonce + tag + ciphertext
-    return encrypted_data
+def encrypt_bytes(data: bytes, key: bytes) -> bytes:
+    """
+    Encrypt the provided bytes using the provided key.
+    :return: Envelope - version byte, nonce, tag and ciphertext.
+    """
+    cipher = AES.new(key, AES.MODE_GCM, nonce=os.urandom(ENVELOPE_NONCE_SIZE))
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return b"".join((bytes((ENVELOPE_VERSION,)), cipher.nonce, tag, ciphertext))
+
+
+def decrypt_bytes(envelope: bytes, key: bytes) -> bytes:
+    """Decrypt the envelope made by :func:`encrypt_bytes` using the provided key."""
+    view = memoryview(envelope)
+    header_size = 1 + ENVELOPE_NONCE_SIZE + ENVELOPE_TAG_SIZE
+    cipher = AES.new(key, AES.MODE_GCM, nonce=view[1:1 + ENVELOPE_NONCE_SIZE])
+    return cipher.decrypt_and_verify(view[header_size:], view[1 + ENVELOPE_NONCE_SIZE:header_size])
+
+
+def wrap_key(key: bytes, wrapping_key: bytes) -> bytes:
+    """Encrypt the key with the wrapping key."""
+    return encrypt_bytes(key, wrapping_key)
+
+
+def unwrap_key(wrapped_key: bytes, wrapping_key: bytes) -> bytes:
+    """Decrypt the key wrapped by :func:`wrap_key`."""
+    return decrypt_bytes(wrapped_key, wrapping_key)
 
 
 def decrypt_data(encrypted_data: bytes, key: bytes) -> str:
-    """Decrypt the provided string data using the provided key."""
-    nonce = encrypted_data[16:32]
-    tag = encrypted_data[32:48]
-    ciphertext = encrypted_data[48:]
+    """Decrypt the provided string data using the provided key. Reads current and legacy envelopes."""
+    # Slices of memoryview don't copy the data
+    view = memoryview(encrypted_data)
+    header_size = 1 + ENVELOPE_NONCE_SIZE + ENVELOPE_TAG_SIZE
+
+    if view[0] == ENVELOPE_VERSION and len(view) >= header_size:
+        try:
+            return decrypt_bytes(view, key).decode("utf-8")
+        except ValueError:
+            # Legacy envelope which salt starts with the version byte
+            pass
+
+    nonce = view[16:32]
+    tag = view[32:LEGACY_ENVELOPE_HEADER_SIZE]
+    ciphertext = view[LEGACY_ENVELOPE_HEADER_SIZE:]
 
     cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
     decrypted_data = cipher.decrypt_and_verify(ciphertext, tag)
     return decrypted_data.decode("utf-8")
 
 
+def encrypt_many(values: Iterable[str], key: bytes) -> list[bytes]:
+    """
+    Encrypt the provided strings using the provided key. Large batches are encrypted in parallel.
+    :param values: Strings to encrypt.
+    :param key: Key to encrypt the values with.
+    :return: Encrypted values in the same order.
+    """
+    return map_batches(lambda batch: [encrypt_data(value, key) for value in batch], list(values))
+
+
+def decrypt_many(values: Iterable[bytes], key: bytes) -> list[str]:
+    """
+    Decrypt the provided data using the provided key. Large batches are decrypted in parallel.
+    :param values: Encrypted values.
+    :param key: Key the values are encrypted with.
+    :return: Decrypted strings in the same order.
+    """
+    return map_batches(lambda batch: [decrypt_data(value, key) for value in batch], list(values))
+
+
+def map_batches(task: Callable[[list], list], values: list) -> list:
+    """
+    Applies task to batches of values. Batches of CRYPTO_PARALLEL_THRESHOLD values and more are split
+    into CRYPTO_BATCH_SIZE chunks processed on a thread pool, pycryptodome releases the GIL.
+    :param task: Function mapping a list of values to a list of results.
+    :param values: Values to process.
+    :return: Results in the order of values.
+    """
+    if len(values) < CRYPTO_PARALLEL_THRESHOLD:
+        return task(values)
+
+    batches = [values[i:i + CRYPTO_BATCH_SIZE] for i in range(0, len(values), CRYPTO_BATCH_SIZE)]
+    return [result for results in crypto_pool().map(task, batches) for result in results]
+
+
+@lru_cache(maxsize=1)
+def crypto_pool() -> ThreadPoolExecutor:
+    """Gets thread pool for batch encryption and decryption, starting it on first use."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="crypto")
+
+
 def generate_password() -> str:
     """Generates password(18-24 characters)."""
     letters = ('a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u',
@@ -147,67 +283,3 @@ def generate_password() -> str:
     random.shuffle(password)
     password = "".join(password)
     return password
-
-
-def generate_pdf(filename: str, data: list, title: str, password: str):
-    """
-    Generates pdf file with `data` table.
-    :param filename: Name of the file.
-    :param data: Table content.
-    :param title: Title of the table.
-    :param password: Sets a password for the file.
-    """
-    # Set up encryption
-    encryption = StandardEncryption(userPassword=password, canPrint=1)
-
-    # Create the document with encryption
-    c = canvas.Canvas(filename, pagesize=A4, encrypt=encryption)
-
-    # Set up the styles
-    styles = getSampleStyleSheet()
-    style_title = styles['Title']
-
-    # Title
-    title_paragraph = Paragraph(title, style_title)
-    title_paragraph.wrapOn(c, A4[0] - 2 * inch, A4[1] - 2 * inch)
-    title_paragraph.drawOn(c, inch, A4[1] - 1.5 * inch)
-
-    # Calculate the number of tables needed
-    rows_per_table = 25
-    number_of_tables = (len(data) + rows_per_table - 1) // rows_per_table
-
-    for table_index in range(number_of_tables):
-        # Calculate the start and end row indices for the current table
-        start_row = table_index * rows_per_table
-        end_row = min(start_row + rows_per_table, len(data))
-
-        # Create the table with the current subset of rows
-        table_data = data[start_row:end_row]
-        table = Table(table_data)
-
-        # Style the table
-        style = TableStyle([
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),  # Increase font size
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),  # Bottom padding to add space below text
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ])
-        table.setStyle(style)
-
-        # Calculate table position for centering on the x-axis
-        table_width, table_height = table.wrap(0, 0)
-        x_position = (A4[0] - table_width) / 2
-        y_position = A4[1] - table_height - (2 * inch if table_index == 0 else inch)  # Adjust y_position for the title
-
-        # Add the table to the elements
-        table.drawOn(c, x_position, y_position)
-
-        # If it's not the last table, create a new page
-        if table_index < number_of_tables - 1:
-            c.showPage()
-
-    # Save the PDF
-    c.save()
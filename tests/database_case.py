@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.libraries.database import Database as Db
+from src.models.models import Password
+
+FIELDS = ("user_id", "account", "username", "password")  # Columns filled when creating `passwords` rows
+
+
+def accounts() -> list[str]:
+    """Gets accounts of all `passwords` rows in order of their ids."""
+    return [row["account"] for row in Password.find()]
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Connects every test to a fresh, migrated database file in a temporary directory."""
+    profile: str = "safe"
+    search_index: bool = False
+    connect: bool = True  # Tests which prepare the database file first connect with :meth:`connect_database`
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, "test.db")
+
+        if self.connect:
+            self.connect_database()
+
+    def tearDown(self):
+        if Db.pool:
+            Db.close_connection()
+
+        shutil.rmtree(self.directory)
+
+    def connect_database(self):
+        """Connects to the test's database file, migrating it."""
+        Db.create_connection(self.db_path, self.profile, search_index=self.search_index)
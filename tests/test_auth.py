@@ -0,0 +1,81 @@
+import os
+import unittest
+from unittest import mock
+from src.libraries.auth import Auth, Credentials
+from src.libraries.key_policy import KeyPolicy
+from src.models.models import Password, User
+from src.utils import helpers
+from tests.database_case import FIELDS, DatabaseTestCase
+from tests.test_helpers import legacy_envelope
+
+KDF_COST = 1000  # Kept low so the tests don't spend time deriving keys
+HASH_COST = 4
+
+
+@mock.patch.object(KeyPolicy, "kdf_cost", return_value=KDF_COST)
+@mock.patch.object(KeyPolicy, "hash_cost", return_value=HASH_COST)
+class AuthTest(DatabaseTestCase):
+    EMAIL: str = "user@example.com"
+
+    def create_legacy_user(self, password: str, key: str, salt: bytes) -> int:
+        """Creates user from before data keys were wrapped, whose entries are encrypted with the derived key."""
+        columns = {
+            "email": self.EMAIL,
+            "password": KeyPolicy.hash_password(password),
+            "key": KeyPolicy.hash_password(key),
+            "salt": salt,
+            "kdf_cost": KDF_COST
+        }
+        User.create(tuple(columns.keys()), tuple(columns.values()))
+        return User.find_by("email = ?", [self.EMAIL], limit=1)["id"]
+
+    def test_sign_up_creates_user_with_random_data_key(self, *_):
+        user, key = Auth.sign_up(self.EMAIL, "password")
+        row = User.find_by_id(user.id)
+
+        self.assertEqual(user.email, self.EMAIL)
+        self.assertEqual(len(user.key), 32)
+        self.assertNotEqual(user.key, helpers.get_key(key, row["salt"], row["kdf_algorithm"], row["kdf_cost"]))
+        self.assertEqual(Auth.authenticate(Credentials(self.EMAIL, "password", key)).key, user.key)
+        self.assertIsNone(Auth.user)
+
+    def test_new_users_get_distinct_keys(self, *_):
+        first, first_key = Auth.sign_up("first@example.com", "password")
+        second, second_key = Auth.sign_up("second@example.com", "password")
+
+        self.assertNotEqual(first_key, second_key)
+        self.assertNotEqual(first.key, second.key)
+        self.assertNotEqual(first.salt, second.salt)
+
+    def test_wrong_credentials(self, *_):
+        _, key = Auth.sign_up(self.EMAIL, "password")
+
+        self.assertIsNone(Auth.authenticate(Credentials(self.EMAIL, "wrong", key)))
+        self.assertIsNone(Auth.authenticate(Credentials(self.EMAIL, "password", "wrong")))
+        self.assertIsNone(Auth.authenticate(Credentials("other@example.com", "password", key)))
+
+    def test_legacy_user_keeps_derived_key_as_data_key(self, *_):
+        salt = os.urandom(16)
+        derived_key = helpers.get_key("key", salt, "pbkdf2_sha256", KDF_COST)
+        user_id = self.create_legacy_user("password", "key", salt)
+        Password.create(
+            FIELDS,
+            (user_id, "site", legacy_envelope("name", derived_key, salt), legacy_envelope("secret", derived_key, salt))
+        )
+
+        user = Auth.authenticate(Credentials(self.EMAIL, "password", "key"))
+        row = User.find_by_id(user_id)
+
+        self.assertEqual(user.key, derived_key)
+        self.assertIsNotNone(row["wrapped_key"])
+        self.assertNotEqual(row["salt"], salt)
+
+        # Entries stay readable with the unwrapped key and their envelopes no longer depend on the old salt
+        user = Auth.authenticate(Credentials(self.EMAIL, "password", "key"))
+        entry = Password.find_by("user_id = ?", [user_id], limit=1)
+        self.assertEqual(user.key, derived_key)
+        self.assertEqual(helpers.decrypt_bytes(entry["password"], user.key), b"secret")
+
+
+if __name__ == "__main__":
+    unittest.main()
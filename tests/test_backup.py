@@ -0,0 +1,117 @@
+import gzip
+import os
+import sqlite3
+import unittest
+from src.libraries.database import Database as Db
+from src.models.models import Password
+from tests.database_case import FIELDS, accounts, DatabaseTestCase
+
+
+class BackupTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backups = os.path.join(self.directory, "backups")
+        Password.create(FIELDS, (1, "site", b"u", b"p"))
+
+    def snapshot(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory, name)
+        with gzip.open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def database(self, statements: list[str], content: bytes = b"") -> bytes:
+        """Runs the statements on a copy of the database content."""
+        path = os.path.join(self.directory, "other.db")
+        with open(path, "wb") as file:
+            file.write(content)
+
+        connection = sqlite3.connect(path)
+        for statement in statements:
+            connection.execute(statement)
+        connection.commit()
+        connection.close()
+
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_writes_compressed_snapshot(self):
+        path = Db.backup(self.backups)
+
+        self.assertRegex(os.path.basename(path), r"^test-\d{8}-\d{6}\.db\.gz$")
+        self.assertEqual(os.listdir(self.backups), [os.path.basename(path)])
+        with gzip.open(path, "rb") as file:
+            self.assertEqual(file.read(16), b"SQLite format 3\x00")
+
+    def test_unchanged_database_is_skipped(self):
+        self.assertIsNotNone(Db.backup(self.backups))
+        self.assertIsNone(Db.backup(self.backups))
+
+        Password.create(FIELDS, (1, "other", b"u", b"p"))
+        self.assertIsNotNone(Db.backup(self.backups))
+
+    def test_rewritten_file_with_same_content_is_skipped(self):
+        path = Db.backup(self.backups)
+        # Checkpoint on close rewrites the file, the modification time moves past the snapshot's
+        Db.close_connection()
+        self.connect_database()
+        os.utime(self.db_path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+        self.assertIsNone(Db.backup(self.backups))
+        self.assertIsNone(Db.backup(self.backups))
+        self.assertEqual(os.listdir(self.backups), [os.path.basename(path)])
+
+    def test_damaged_newest_snapshot_is_replaced(self):
+        path = Db.backup(self.backups)
+        with open(path, "r+b") as file:
+            file.seek(20)
+            file.write(os.urandom(64))
+        os.utime(path, (0, 0))
+        os.rename(path, os.path.join(self.backups, "test-20000101-000000.db.gz"))
+
+        self.assertIsNotNone(Db.backup(self.backups))
+
+    def test_keeps_newest_snapshots(self):
+        os.makedirs(self.backups)
+        for day in range(1, 4):
+            old = os.path.join(self.backups, f"test-2000010{day}-000000.db.gz")
+            open(old, "wb").close()
+            os.utime(old, (0, 0))
+
+        path = Db.backup(self.backups, keep=2)
+
+        self.assertEqual(sorted(os.listdir(self.backups)), ["test-20000103-000000.db.gz", os.path.basename(path)])
+
+    def test_at_least_one_snapshot_is_kept(self):
+        with self.assertRaises(ValueError):
+            Db.backup(self.backups, keep=0)
+
+    def test_restore(self):
+        path = Db.backup(self.backups)
+        Password.create(FIELDS, (1, "after backup", b"u", b"p"))
+
+        Db.restore(path)
+
+        self.assertEqual(accounts(), ["site"])
+
+    def test_rejected_snapshots_leave_database_untouched(self):
+        with gzip.open(Db.backup(self.backups), "rb") as file:
+            content = file.read()
+        newer = self.database(["PRAGMA user_version = 1000"], content)
+        snapshots = (
+            self.snapshot("damaged.db.gz", content[:len(content) // 2] + os.urandom(len(content) - len(content) // 2)),
+            self.snapshot("foreign.db.gz", self.database(["CREATE TABLE notes (text)", "PRAGMA user_version = 1"])),
+            self.snapshot("newer.db.gz", newer),
+            self.snapshot("empty.db.gz", b"")
+        )
+        Password.create(FIELDS, (1, "after backup", b"u", b"p"))
+
+        for snapshot in snapshots:
+            with self.subTest(snapshot=os.path.basename(snapshot)), self.assertRaises(sqlite3.DatabaseError):
+                Db.restore(snapshot)
+
+        self.assertEqual(accounts(), ["site", "after backup"])
+        self.assertFalse(os.path.exists(f"{self.db_path}.restore"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sqlite3
+import threading
+import unittest
+from src.libraries.database import Database as Db
+from tests.database_case import DatabaseTestCase
+
+
+def in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class ConnectionPoolTest(DatabaseTestCase):
+    def test_connection_per_thread(self):
+        self.assertIs(Db.connection(), Db.connection())
+        self.assertIsNot(in_thread(Db.connection), Db.connection())
+
+    def test_profile_is_applied_to_every_connection(self):
+        self.assertEqual(in_thread(lambda: Db.pragmas()["journal_mode"]), "wal")
+        self.assertEqual(in_thread(lambda: Db.pragmas()["busy_timeout"]), 5000)
+
+    def test_connections_of_finished_threads_are_closed(self):
+        finished = in_thread(Db.connection)
+        in_thread(Db.connection)
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            finished.execute("SELECT 1")
+
+    def test_closed_pool_raises(self):
+        conn = Db.connection()
+        Db.close_connection()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            Db.connection()
+
+
+if __name__ == "__main__":
+    unittest.main()
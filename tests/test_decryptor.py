@@ -0,0 +1,56 @@
+import os
+import unittest
+from src.libraries.decryptor import Decryptor
+from src.utils import helpers
+
+
+class DecryptorTest(unittest.TestCase):
+    def setUp(self):
+        self.key = os.urandom(32)
+        self.decryptor = Decryptor(self.key, maxsize=2)
+
+    def entry(self, __id: int, username: str) -> dict:
+        return {"id": __id, "username": helpers.encrypt_data(username, self.key)}
+
+    def test_decrypts_and_caches(self):
+        entry = self.entry(1, "alice")
+
+        self.assertFalse(self.decryptor.is_decrypted(entry, "username"))
+        self.assertEqual(self.decryptor.get(entry, "username"), "alice")
+        self.assertTrue(self.decryptor.is_decrypted(entry, "username"))
+
+    def test_changed_entry_is_not_served_stale(self):
+        self.decryptor.get(self.entry(1, "alice"), "username")
+
+        self.assertEqual(self.decryptor.get(self.entry(1, "bob"), "username"), "bob")
+
+    def test_least_recently_used_field_is_evicted(self):
+        first, second, third = self.entry(1, "a"), self.entry(2, "b"), self.entry(3, "c")
+        self.decryptor.warm([first, second], "username")
+        self.decryptor.get(first, "username")
+        self.decryptor.get(third, "username")
+
+        self.assertTrue(self.decryptor.is_decrypted(first, "username"))
+        self.assertFalse(self.decryptor.is_decrypted(second, "username"))
+        self.assertTrue(self.decryptor.is_decrypted(third, "username"))
+
+    def test_uncached_get(self):
+        entry = self.entry(1, "alice")
+
+        self.assertEqual(self.decryptor.get(entry, "username", cache=False), "alice")
+        self.assertFalse(self.decryptor.is_decrypted(entry, "username"))
+
+    def test_forget_and_clear(self):
+        first, second = self.entry(1, "a"), self.entry(2, "b")
+        self.decryptor.warm([first, second], "username")
+        self.decryptor.forget(1)
+
+        self.assertFalse(self.decryptor.is_decrypted(first, "username"))
+        self.assertTrue(self.decryptor.is_decrypted(second, "username"))
+
+        self.decryptor.clear()
+        self.assertFalse(self.decryptor.is_decrypted(second, "username"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.libraries import export
+from src.libraries.export import EncryptedStream, Export
+from src.libraries.jobs import Job, JobCancelled
+from src.libraries.key_policy import KeyPolicy
+from src.utils import helpers
+
+KDF_COST = 1000  # Kept low so the tests don't spend time deriving keys
+
+
+def read(data: bytes, password: str) -> bytes:
+    return b"".join(EncryptedStream.read(io.BytesIO(data), password))
+
+
+@mock.patch.object(KeyPolicy, "kdf_cost", return_value=KDF_COST)
+class EncryptedStreamTest(unittest.TestCase):
+    def encrypt(self, data: bytes, password: str = "password") -> bytes:
+        file = io.BytesIO()
+        stream = EncryptedStream(file, password)
+        # Written in pieces not aligned to chunks
+        for start in range(0, len(data), 1000):
+            stream.write(data[start:start + 1000])
+        stream.close()
+        return file.getvalue()
+
+    def test_round_trip_across_chunks(self, _):
+        data = os.urandom(EncryptedStream.CHUNK_SIZE * 2 + 123)
+
+        self.assertEqual(read(self.encrypt(data), "password"), data)
+
+    def test_empty_stream(self, _):
+        self.assertEqual(read(self.encrypt(b""), "password"), b"")
+
+    def test_wrong_password(self, _):
+        with self.assertRaises(ValueError):
+            read(self.encrypt(b"data"), "wrong")
+
+    def test_truncated_stream(self, _):
+        data = self.encrypt(os.urandom(EncryptedStream.CHUNK_SIZE * 2))
+        # Data fills two chunks, the second one is the last
+        last_chunk = EncryptedStream.CHUNK_HEADER.size + 16 + EncryptedStream.CHUNK_SIZE
+
+        with self.assertRaises(ValueError):
+            read(data[:-last_chunk], "password")
+
+        with self.assertRaises(ValueError):
+            read(data[:-1], "password")
+
+    def test_modified_stream(self, _):
+        data = bytearray(self.encrypt(b"data"))
+        data[-1] ^= 1
+
+        with self.assertRaises(ValueError):
+            read(bytes(data), "password")
+
+    def test_not_an_export(self, _):
+        with self.assertRaises(ValueError):
+            read(b"PK\x03\x04 zip file", "password")
+
+        with self.assertRaises(ValueError):
+            read(b"", "password")
+
+
+@mock.patch.object(KeyPolicy, "kdf_cost", return_value=KDF_COST)
+class ExportTest(unittest.TestCase):
+    ROWS: list = [("example.com", "alice", "p,a\"ss"), ("app", "bob", "ünïcode\nline")]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.key = os.urandom(32)
+        self.entries = [
+            {"account": account, "username": helpers.encrypt_data(username, self.key),
+             "password": helpers.encrypt_data(password, self.key)}
+            for account, username, password in self.ROWS
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def decrypt_file(self, path: str) -> str:
+        with open(path, "rb") as file:
+            return b"".join(EncryptedStream.read(file, "password")).decode()
+
+    def test_csv(self, _):
+        path = os.path.join(self.directory, "export.csv.enc")
+
+        self.assertEqual(Export.to_file(path, self.entries, self.key, "Title", "password"), 2)
+        rows = list(csv.reader(io.StringIO(self.decrypt_file(path))))
+        self.assertEqual(rows, [list(Export.FIELDS), *map(list, self.ROWS)])
+
+    def test_jsonl(self, _):
+        path = os.path.join(self.directory, "export")
+
+        self.assertEqual(Export.to_file(path, self.entries, self.key, "Title", "password", "jsonl"), 2)
+        records = [json.loads(line) for line in self.decrypt_file(path).splitlines()]
+        self.assertEqual(records, [dict(zip(Export.FIELDS, row)) for row in self.ROWS])
+
+    def test_failed_export_removes_file(self, _):
+        path = os.path.join(self.directory, "export.csv.enc")
+
+        with self.assertRaises(ValueError):
+            Export.csv(path, self.entries, os.urandom(32), "password")
+
+        self.assertFalse(os.path.exists(path))
+
+    def test_decrypt(self, _):
+        path = os.path.join(self.directory, "export.jsonl.enc")
+        output = os.path.join(self.directory, "export.jsonl")
+        Export.jsonl(path, self.entries, self.key, "password")
+
+        Export.decrypt(path, output, "password")
+
+        with open(output, encoding="utf-8") as file:
+            self.assertEqual([json.loads(line)["password"] for line in file], [row[2] for row in self.ROWS])
+
+    def test_failed_decryption_removes_output(self, _):
+        path = os.path.join(self.directory, "export.csv.enc")
+        output = os.path.join(self.directory, "export.csv")
+        Export.csv(path, self.entries, self.key, "password")
+
+        with self.assertRaises(ValueError):
+            Export.decrypt(path, output, "wrong")
+
+        with self.assertRaises(ValueError):
+            Export.decrypt(path, path, "password")
+
+        self.assertFalse(os.path.exists(output))
+        self.assertTrue(os.path.exists(path))
+
+    def test_decrypt_command(self, _):
+        path = os.path.join(self.directory, "export.csv.enc")
+        Export.csv(path, self.entries, self.key, "password")
+
+        with mock.patch("getpass.getpass", return_value="password"), mock.patch("builtins.print"):
+            export.main(["decrypt", path])
+
+        with open(os.path.join(self.directory, "export.csv"), newline="", encoding="utf-8") as file:
+            self.assertEqual(list(csv.reader(file))[1:], list(map(list, self.ROWS)))
+
+        with mock.patch("getpass.getpass", return_value="wrong"), mock.patch("sys.stderr"):
+            with self.assertRaises(SystemExit) as exit_error:
+                export.main(["decrypt", path, os.path.join(self.directory, "other.csv")])
+
+        self.assertEqual(exit_error.exception.code, 1)
+
+    def test_format_of(self, _):
+        self.assertEqual(Export.format_of("/tmp/Export.PDF"), "pdf")
+        self.assertEqual(Export.format_of("export.csv.enc"), "csv")
+        self.assertEqual(Export.format_of("export.jsonl.enc"), "jsonl")
+
+        with self.assertRaises(ValueError):
+            Export.format_of("export.csv")
+
+    def test_target(self, _):
+        self.assertEqual(Export.target("export", "Encrypted CSV files"), ("export.csv.enc", "csv"))
+        self.assertEqual(Export.target("export.csv.enc", "Encrypted CSV files"), ("export.csv.enc", "csv"))
+        self.assertEqual(Export.target("export.pdf", "All files"), ("export.pdf", "pdf"))
+
+        with self.assertRaises(ValueError):
+            Export.target("export", "All files")
+
+
+class CancellingJob(Job):
+    """Job cancelled by its first progress report."""
+    def report(self, value: float, message: str = ""):
+        super().report(value, message)
+        self.cancel()
+
+
+class PdfExportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "export.pdf")
+        self.key = os.urandom(32)
+        # Spans several table flowables, one value is longer than the column
+        values = helpers.encrypt_many([f"value{i}" for i in range(Export.CHUNK_SIZE * 2 + 5)] + ["x" * 200], self.key)
+        self.entries = [{"account": "<site & co>", "username": value, "password": value} for value in values]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_writes_document_and_reports_progress(self):
+        job = Job()
+
+        self.assertEqual(Export.pdf(self.path, self.entries, self.key, "Title", "password", job), len(self.entries))
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(5), b"%PDF-")
+        self.assertEqual(job.progress_updates()[-1][0], 1.0)
+
+    def test_cancelled_export_removes_file(self):
+        with self.assertRaises(JobCancelled):
+            Export.pdf(self.path, self.entries, self.key, "Title", "password", CancellingJob())
+
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
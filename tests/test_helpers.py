@@ -0,0 +1,98 @@
+import os
+import unittest
+from Crypto.Cipher import AES
+from src.libraries.vault import Vault
+from src.models.models import Password
+from src.utils import helpers
+from tests.database_case import FIELDS, DatabaseTestCase
+
+
+def legacy_envelope(data: str, key: bytes, salt: bytes) -> bytes:
+    """Encrypts data in the format used before envelopes were versioned: salt, nonce, tag and ciphertext."""
+    cipher = AES.new(key, AES.MODE_GCM, nonce=os.urandom(16))
+    ciphertext, tag = cipher.encrypt_and_digest(data.encode())
+    return salt + cipher.nonce + tag + ciphertext
+
+
+class BatchCryptoTest(unittest.TestCase):
+    def setUp(self):
+        self.key = os.urandom(32)
+
+    def test_small_batch_round_trip(self):
+        values = ["a", "", "ünïcode"]
+
+        self.assertEqual(helpers.decrypt_many(helpers.encrypt_many(values, self.key), self.key), values)
+
+    def test_parallel_batch_keeps_order(self):
+        values = [str(i) for i in range(helpers.CRYPTO_PARALLEL_THRESHOLD + helpers.CRYPTO_BATCH_SIZE // 2)]
+        encrypted = helpers.encrypt_many(values, self.key)
+
+        self.assertEqual(len(encrypted), len(values))
+        self.assertEqual(helpers.decrypt_data(encrypted[-1], self.key), values[-1])
+        self.assertEqual(helpers.decrypt_many(encrypted, self.key), values)
+
+    def test_empty_batch(self):
+        self.assertEqual(helpers.encrypt_many([], self.key), [])
+        self.assertEqual(helpers.decrypt_many([], self.key), [])
+
+
+class EnvelopeTest(unittest.TestCase):
+    def setUp(self):
+        self.key = os.urandom(32)
+
+    def test_current_envelope(self):
+        envelope = helpers.encrypt_data("secret", self.key)
+
+        self.assertEqual(envelope[0], helpers.ENVELOPE_VERSION)
+        self.assertEqual(len(envelope), 1 + helpers.ENVELOPE_NONCE_SIZE + helpers.ENVELOPE_TAG_SIZE + len("secret"))
+        self.assertEqual(helpers.decrypt_bytes(envelope, self.key), b"secret")
+        self.assertEqual(helpers.decrypt_data(envelope, self.key), "secret")
+
+    def test_legacy_envelope(self):
+        envelope = legacy_envelope("secret", self.key, os.urandom(16))
+
+        self.assertEqual(helpers.decrypt_data(envelope, self.key), "secret")
+        with self.assertRaises(ValueError):
+            helpers.decrypt_bytes(envelope, self.key)
+
+    def test_legacy_envelope_starting_with_version_byte(self):
+        salt = bytes((helpers.ENVELOPE_VERSION,)) + os.urandom(15)
+        envelope = legacy_envelope("secret", self.key, salt)
+
+        self.assertEqual(helpers.decrypt_data(envelope, self.key), "secret")
+
+    def test_tampered_envelope(self):
+        envelope = bytearray(helpers.encrypt_data("secret", self.key))
+        envelope[-1] ^= 1
+
+        with self.assertRaises(ValueError):
+            helpers.decrypt_data(bytes(envelope), self.key)
+
+    def test_wrong_key(self):
+        with self.assertRaises(ValueError):
+            helpers.decrypt_data(helpers.encrypt_data("secret", self.key), os.urandom(32))
+
+    def test_wrapped_key(self):
+        data_key, wrapping_key = os.urandom(32), os.urandom(32)
+
+        self.assertEqual(helpers.unwrap_key(helpers.wrap_key(data_key, wrapping_key), wrapping_key), data_key)
+
+
+class UpgradeEnvelopesTest(DatabaseTestCase):
+    def test_rewrites_only_legacy_entries(self):
+        key, salt = os.urandom(32), os.urandom(16)
+        Password.create(FIELDS, (1, "legacy", legacy_envelope("u1", key, salt), legacy_envelope("p1", key, salt)))
+        Password.create(FIELDS, (1, "current", helpers.encrypt_data("u2", key), helpers.encrypt_data("p2", key)))
+        current = Password.find_by("account = ?", ["current"], limit=1)
+
+        self.assertEqual(Vault.upgrade_envelopes(1, key, salt), 1)
+        self.assertEqual(Vault.upgrade_envelopes(1, key, salt), 0)
+
+        legacy = Password.find_by("account = ?", ["legacy"], limit=1)
+        self.assertEqual(helpers.decrypt_bytes(legacy["username"], key), b"u1")
+        self.assertEqual(helpers.decrypt_bytes(legacy["password"], key), b"p1")
+        self.assertEqual(Password.find_by("account = ?", ["current"], limit=1)["password"], current["password"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+from unittest import mock
+from src.libraries.importer import Importer, ImportResult, InvalidImportFile
+from src.libraries.jobs import JobCancelled
+from src.models.models import Password
+from src.utils import helpers
+from tests.database_case import DatabaseTestCase
+from tests.test_export import CancellingJob
+
+
+class ColumnsTest(unittest.TestCase):
+    def test_chrome_header(self):
+        columns = Importer.columns(["name", "url", "username", "password", "note"])
+
+        self.assertEqual(columns, {"account": 0, "url": 1, "username": 2, "password": 3})
+
+    def test_firefox_header(self):
+        columns = Importer.columns(["url", "username", "password", "httpRealm", "formActionOrigin", "guid"])
+
+        self.assertEqual(columns, {"account": None, "url": 0, "username": 1, "password": 2})
+
+    def test_bitwarden_header(self):
+        header = ["folder", "favorite", "type", "name", "notes", "fields", "reprompt",
+                  "login_uri", "login_username", "login_password", "login_totp"]
+
+        self.assertEqual(Importer.columns(header), {"account": 3, "url": 7, "username": 8, "password": 9})
+
+    def test_header_names_are_normalised(self):
+        columns = Importer.columns([" Web/App ", "USERNAME", "Password"])
+
+        self.assertEqual(columns, {"account": 0, "url": None, "username": 1, "password": 2})
+
+    def test_mapping_overrides_recognised_columns(self):
+        columns = Importer.columns(["name", "Site", "Login", "Secret"], {"account": "site", "password": "Secret"})
+
+        self.assertEqual(columns, {"account": 1, "url": None, "username": 2, "password": 3})
+
+    def test_invalid_headers(self):
+        with self.assertRaises(InvalidImportFile):
+            Importer.columns(["name", "password"], {"username": "Login"})
+
+        with self.assertRaises(InvalidImportFile):
+            Importer.columns(["name", "username"])
+
+        with self.assertRaises(InvalidImportFile):
+            Importer.columns(["username", "password"])
+
+        with self.assertRaises(InvalidImportFile):
+            Importer.columns(["name", "password"])
+
+        with self.assertRaises(InvalidImportFile):
+            Importer.columns([])
+
+
+class ImportTest(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.key = os.urandom(32)
+        self.path = os.path.join(self.directory, "import.csv")
+
+    def write(self, content: str):
+        with open(self.path, "w", encoding="utf-8-sig", newline="") as file:
+            file.write(content)
+
+    def entries(self) -> list[tuple[str, str, str]]:
+        return [
+            (row["account"], *(helpers.decrypt_data(row[column], self.key) for column in ("username", "password")))
+            for row in Password.find_by("user_id = ?", [1])
+        ]
+
+    def test_imports_encrypted_entries(self):
+        self.write(
+            "url,username,password\r\n"
+            "https://example.com/login,alice, pass word \r\n"
+            "https://empty.example.com,bob,\r\n"
+            "app,carol,\"multi\nline\"\r\n"
+            ",dave,secret\r\n"
+            "https://blank.example.com,  ,secret\r\n"
+            "short\r\n"
+        )
+
+        self.assertEqual(Importer.csv(self.path, 1, self.key), ImportResult(imported=2, skipped=4))
+        self.assertEqual(self.entries(), [("example.com", "alice", " pass word "), ("app", "carol", "multi\nline")])
+        self.assertNotEqual(Password.find(limit=1)["password"], b"multi\nline")
+
+    def test_invalid_file_imports_nothing(self):
+        self.write("name,username\r\nsite,alice\r\n")
+
+        with self.assertRaises(InvalidImportFile):
+            Importer.csv(self.path, 1, self.key)
+
+        self.assertEqual(self.entries(), [])
+
+    @mock.patch.object(Importer, "BATCH_SIZE", 2)
+    def test_cancel_keeps_stored_batches(self):
+        self.write("name,username,password\r\n" + "".join(f"site{i},user,pass{i}\r\n" for i in range(5)))
+
+        with self.assertRaises(JobCancelled):
+            Importer.csv(self.path, 1, self.key, job=CancellingJob())
+
+        self.assertEqual([entry[0] for entry in self.entries()], ["site0", "site1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+from src.libraries.jobs import JobScheduler, JobCancelled
+
+
+class ImmediateRoot:
+    """Stands in for the Tk root: `after` runs the callback right away instead of on the main loop."""
+    def __init__(self):
+        self.reported: list[Exception] = []
+
+    def after(self, _ms: int, callback):
+        # Running jobs are polled again by nested calls, a short pause lets them finish meanwhile.
+        # No id is returned, so polling is scheduled again for the next submitted job
+        time.sleep(0.001)
+        callback()
+
+    def after_cancel(self, _id):
+        pass
+
+    def report_callback_exception(self, _type, error: Exception, _traceback):
+        self.reported.append(error)
+
+
+class JobSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = ImmediateRoot()
+        self.scheduler = JobScheduler(self.root, max_workers=2)
+        self.calls: list[tuple] = []
+
+    def tearDown(self):
+        self.scheduler.shutdown(wait=True)
+
+    def callbacks(self) -> dict:
+        return {
+            "on_success": lambda result: self.calls.append(("success", result)),
+            "on_error": lambda error: self.calls.append(("error", error)),
+            "on_cancel": lambda: self.calls.append(("cancel",))
+        }
+
+    def test_success(self):
+        self.scheduler.submit(pow, 2, 10, **self.callbacks())
+
+        self.assertEqual(self.calls, [("success", 1024)])
+
+    def test_error(self):
+        error = ValueError("failed")
+
+        def fail():
+            raise error
+
+        self.scheduler.submit(fail, **self.callbacks())
+        self.scheduler.submit(fail)
+
+        self.assertEqual(self.calls, [("error", error)])
+        self.assertEqual(self.root.reported, [error])
+
+    def test_progress_is_delivered(self):
+        def task(job):
+            for step in range(1, 4):
+                job.report(step / 3, f"step {step}")
+            return "done"
+
+        progress = []
+        self.scheduler.submit(task, progress=True, on_progress=lambda *update: progress.append(update),
+                              **self.callbacks())
+
+        self.assertEqual(progress, [(1 / 3, "step 1"), (2 / 3, "step 2"), (1.0, "step 3")])
+        self.assertEqual(self.calls, [("success", "done")])
+
+    def cancelled_task(self, check: bool):
+        """
+        Gets task cancelled from the main loop by its first progress report, like by a "Cancel" button.
+        :param check: Task checks for cancellation before it finishes.
+        """
+        jobs, cancelled = [], threading.Event()
+
+        def task(job):
+            jobs.append(job)
+            job.report(0)
+            cancelled.wait(5)
+
+            if check:
+                job.check()
+            return "finished"
+
+        def on_progress(*_):
+            jobs[0].cancel()
+            cancelled.set()
+
+        return task, on_progress
+
+    def test_task_stopped_by_cancellation(self):
+        task, on_progress = self.cancelled_task(check=True)
+        job = self.scheduler.submit(task, progress=True, on_progress=on_progress, **self.callbacks())
+
+        self.assertIsInstance(job.future.exception(), JobCancelled)
+        self.assertEqual(self.calls, [("cancel",)])
+
+    def test_task_finished_after_cancel_calls_on_cancel(self):
+        task, on_progress = self.cancelled_task(check=False)
+        job = self.scheduler.submit(task, progress=True, on_progress=on_progress, **self.callbacks())
+
+        self.assertEqual(job.future.result(), "finished")
+        self.assertEqual(self.calls, [("cancel",)])
+
+    def test_polling_restarts_for_next_job(self):
+        self.scheduler.submit(pow, 2, 2, **self.callbacks())
+        self.scheduler.submit(pow, 3, 2, **self.callbacks())
+
+        self.assertEqual(self.calls, [("success", 4), ("success", 9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
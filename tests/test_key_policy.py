@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+from src.libraries.key_policy import KeyPolicy
+from src.utils import helpers
+
+
+class KeyPolicyTest(unittest.TestCase):
+    def tearDown(self):
+        KeyPolicy.configure("bcrypt", "pbkdf2_sha256", 250)
+
+    def test_calibrated_costs_stay_within_bounds(self):
+        self.assertEqual(KeyPolicy.calibrate("bcrypt", 1), KeyPolicy.MINIMUM_COSTS["bcrypt"])
+        self.assertEqual(KeyPolicy.calibrate("pbkdf2_sha256", 10 ** 9), KeyPolicy.MAXIMUM_COSTS["pbkdf2_sha256"])
+        self.assertEqual(KeyPolicy.calibrate("scrypt", 10 ** 9), KeyPolicy.MAXIMUM_COSTS["scrypt"])
+
+    def test_pbkdf2_cost_is_rounded_to_step(self):
+        self.assertEqual(KeyPolicy.calibrate("pbkdf2_sha256", 2000) % KeyPolicy.PBKDF2_STEP, 0)
+
+    def test_unknown_algorithm_is_rejected(self):
+        with self.assertRaises(KeyError):
+            KeyPolicy.configure("md5", "pbkdf2_sha256", 250)
+
+    def test_key_is_renewed_only_below_margin(self):
+        with mock.patch.object(KeyPolicy, "kdf_cost", return_value=400000):
+            self.assertFalse(KeyPolicy.needs_new_key("pbkdf2_sha256", 400000))
+            self.assertFalse(KeyPolicy.needs_new_key("pbkdf2_sha256", 310000))
+            self.assertTrue(KeyPolicy.needs_new_key("pbkdf2_sha256", 290000))
+            self.assertTrue(KeyPolicy.needs_new_key("scrypt", 2 ** 20))
+
+    def test_bcrypt_hash_is_renewed_one_round_below(self):
+        hashed = helpers.hash_password("secret", "bcrypt", 4)
+
+        with mock.patch.object(KeyPolicy, "hash_cost", return_value=4):
+            self.assertFalse(KeyPolicy.needs_rehash(hashed))
+
+        with mock.patch.object(KeyPolicy, "hash_cost", return_value=5):
+            self.assertTrue(KeyPolicy.needs_rehash(hashed))
+
+    def test_hash_of_other_algorithm_is_renewed(self):
+        KeyPolicy.configure("scrypt", "pbkdf2_sha256", 250)
+        hashed = helpers.hash_password("secret", "bcrypt", 4)
+
+        with mock.patch.object(KeyPolicy, "hash_cost", return_value=2 ** 10):
+            self.assertTrue(KeyPolicy.needs_rehash(hashed))
+
+
+if __name__ == "__main__":
+    unittest.main()
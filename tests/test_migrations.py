@@ -0,0 +1,66 @@
+import sqlite3
+import unittest
+from src.libraries.database import Database as Db
+from src.models import migrations
+from src.models.models import User
+from src.utils.helpers import PBKDF2_ITERATIONS
+from tests.database_case import DatabaseTestCase
+
+LATEST_VERSION = max(
+    migration.version for migration in vars(migrations).values()
+    if isinstance(migration, type) and issubclass(migration, migrations.MigrationBase)
+    and migration is not migrations.MigrationBase
+)
+# Schema of databases created before versioned migrations, user_version 0
+LEGACY_SCHEMA = (
+    "CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, email TEXT NOT NULL, password BLOB NOT NULL, "
+    "passcode BLOB, key BLOB NOT NULL, salt BLOB NOT NULL, theme_color TEXT NOT NULL DEFAULT 'turquoise', "
+    "color_mode TEXT NOT NULL DEFAULT 'light', lock_timer INTEGER DEFAULT 30000)",
+    "CREATE TABLE passwords (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, "
+    "account TEXT NOT NULL, username BLOB NOT NULL, password BLOB NOT NULL)",
+    "INSERT INTO users (email, password, key, salt) VALUES ('old@example.com', x'00', x'00', x'00')"
+)
+
+
+class MigrationsTest(DatabaseTestCase):
+    connect = False
+
+    def create_database(self, *statements: str):
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(";".join(statements))
+        conn.close()
+
+    def user_version(self) -> int:
+        return Db.pragma("user_version").get_one()[0]
+
+    def tables(self) -> set[str]:
+        return {row["name"] for row in Db.select("sqlite_master", ("name",)).where("type = 'table'", []).get()}
+
+    def test_new_database_is_created_at_latest_version(self):
+        self.connect_database()
+
+        self.assertEqual(self.user_version(), LATEST_VERSION)
+        self.assertLessEqual({"users", "passwords"}, self.tables())
+
+    def test_legacy_database_gets_new_columns_with_defaults(self):
+        self.create_database(*LEGACY_SCHEMA)
+        self.connect_database()
+        user = User.find_by("email = ?", ["old@example.com"], limit=1)
+
+        self.assertEqual(self.user_version(), LATEST_VERSION)
+        self.assertEqual(user["kdf_algorithm"], "pbkdf2_sha256")
+        self.assertEqual(user["kdf_cost"], PBKDF2_ITERATIONS)
+        self.assertIsNone(user["wrapped_key"])
+
+    def test_migrating_again_changes_nothing(self):
+        self.connect_database()
+        schema = Db.select("sqlite_master", ("sql",)).get()
+        Db.migrate()
+
+        self.assertEqual(self.user_version(), LATEST_VERSION)
+        self.assertEqual([row["sql"] for row in Db.select("sqlite_master", ("sql",)).get()],
+                         [row["sql"] for row in schema])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import unittest
+from unittest import mock
+from src.libraries.database import Database as Db
+from src.models.models import Password, User
+from tests.database_case import FIELDS, DatabaseTestCase
+
+
+class CreateTest(DatabaseTestCase):
+    def test_create_returns_count(self):
+        self.assertEqual(Password.create(FIELDS, (1, "a", b"u", b"p")), 1)
+        self.assertEqual(Password.create(FIELDS, [(1, "b", b"u", b"p"), (1, "c", b"u", b"p")]), 2)
+
+    def test_returns_single_row(self):
+        rows = Password.create_returning(FIELDS, (1, "a", b"u", b"p"))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(dict(rows[0]), dict(Password.find_by_id(rows[0]["id"])))
+
+    def test_returns_rows_in_order(self):
+        Password.create(FIELDS, (1, "existing", b"u", b"p"))
+        rows = Password.create_returning(FIELDS, [(1, account, b"u", b"p") for account in "cab"], ("account",))
+
+        self.assertEqual([row["account"] for row in rows], ["c", "a", "b"])
+        self.assertEqual([row["account"] for row in Password.find()], ["existing", "c", "a", "b"])
+
+    def test_ignored_rows_are_skipped(self):
+        fields = ("email", "password", "key", "salt")
+        User.create(fields, ("b@example.com", b"p", b"k", b"s"))
+
+        rows = User.create_returning(
+            fields, [(email, b"p", b"k", b"s") for email in ("a@example.com", "b@example.com", "c@example.com")],
+            ("email",), ignore=True
+        )
+
+        self.assertEqual([row["email"] for row in rows], ["a@example.com", "c@example.com"])
+
+    def test_all_rows_ignored(self):
+        fields = ("email", "password", "key", "salt")
+        User.create(fields, ("a@example.com", b"p", b"k", b"s"))
+
+        self.assertEqual(User.create_returning(fields, ("a@example.com", b"p", b"k", b"s"), ignore=True), [])
+
+
+class CreateWithoutReturningTest(CreateTest):
+    """Runs the same tests through the fallback for sqlite without RETURNING clause."""
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(Db, "RETURNING", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SearchCase(DatabaseTestCase):
+    ACCOUNTS: tuple = ("GitHub work", "gitlab", "Mail", "my-github")
+
+    def setUp(self):
+        super().setUp()
+        Password.create(FIELDS, [(1, account, b"u", b"p") for account in self.ACCOUNTS])
+        Password.create(FIELDS, (2, "github", b"u", b"p"))
+
+    def search(self, item: str, full_text: bool = False) -> list[str]:
+        rows = Password.search(item, ["account"], "user_id = :user_id", {"user_id": 1}, full_text=full_text)
+        return [row["account"] for row in rows]
+
+
+class SearchTest(SearchCase):
+    def test_matches_substrings(self):
+        self.assertEqual(self.search("hub"), ["GitHub work", "my-github"])
+
+    def test_full_text_without_index_matches_substrings(self):
+        self.assertFalse(Db.table_exists("passwords_fts"))
+        self.assertEqual(self.search("hub", full_text=True), ["GitHub work", "my-github"])
+
+
+class FullTextSearchTest(SearchCase):
+    search_index = True
+
+    def test_matches_prefixes_of_tokens(self):
+        self.assertTrue(Db.table_exists("passwords_fts"))
+        self.assertEqual(self.search("git", full_text=True), ["GitHub work", "gitlab", "my-github"])
+        self.assertEqual(self.search("hub", full_text=True), [])
+        self.assertEqual(self.search("WORK git", full_text=True), ["GitHub work"])
+        self.assertEqual(self.search("hub"), ["GitHub work", "my-github"])
+
+    def test_item_without_tokens_matches_substrings(self):
+        self.assertEqual(self.search("-", full_text=True), ["my-github"])
+
+    def test_index_follows_writes(self):
+        Password.update(Password.find_by("account = ?", ["gitlab"], limit=1)["id"], {"account": "codeberg"})
+        Password.delete(Password.find_by("account = ?", ["Mail"], limit=1)["id"])
+        Password.create(FIELDS, (1, "Mailbox", b"u", b"p"))
+
+        self.assertEqual(self.search("gitlab", full_text=True), [])
+        self.assertEqual(self.search("code", full_text=True), ["codeberg"])
+        self.assertEqual(self.search("mail", full_text=True), ["Mailbox"])
+
+    def test_rows_stored_before_index_are_indexed(self):
+        Db.close_connection()
+        os.remove(self.db_path)
+        Db.create_connection(self.db_path, self.profile)
+        Password.create(FIELDS, (1, "existing", b"u", b"p"))
+        Db.close_connection()
+        Db.create_connection(self.db_path, self.profile, search_index=True)
+
+        self.assertEqual(self.search("exist", full_text=True), ["existing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
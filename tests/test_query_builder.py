@@ -0,0 +1,68 @@
+import unittest
+from src.mixins.query_builder_mixin import QueryBuilderMixin as Query
+from src.models import tables
+
+
+class StatementCacheTest(unittest.TestCase):
+    def setUp(self):
+        Query.statement.cache_clear()
+
+    def test_statement_is_generated_once_per_shape(self):
+        first = Query.select(tables.Passwords, ("id",)).where("user_id = ?", [1]).build()
+        second = Query.select(tables.Passwords, ("id",)).where("user_id = ?", [2]).build()
+
+        self.assertEqual(first.statement, second.statement)
+        self.assertEqual((first.parameters, second.parameters), ((1,), (2,)))
+        self.assertEqual(Query.statement.cache_info().misses, 1)
+        self.assertEqual(Query.statement.cache_info().hits, 1)
+
+    def test_different_shapes_have_different_statements(self):
+        ascending = Query.select(tables.Passwords, ("id",)).order_by("id").asc().build()
+        descending = Query.select(tables.Passwords, ("id",)).order_by("id").desc().build()
+
+        self.assertEqual(ascending.statement, "SELECT passwords.id FROM passwords ORDER BY id ASC")
+        self.assertEqual(descending.statement, "SELECT passwords.id FROM passwords ORDER BY id DESC")
+
+
+class QueryBuilderTest(unittest.TestCase):
+    def test_clauses_return_new_queries(self):
+        base = Query.select(tables.Passwords, ("id",))
+        filtered = base.where("user_id = ?", [1])
+        limited = filtered.limit(5)
+
+        self.assertEqual(base.build().statement, "SELECT passwords.id FROM passwords")
+        self.assertEqual(filtered.build().statement, "SELECT passwords.id FROM passwords WHERE user_id = ?")
+        self.assertEqual(limited.build().statement, "SELECT passwords.id FROM passwords WHERE user_id = ? LIMIT 5")
+        self.assertEqual(base.build().parameters, ())
+
+    def test_where_appends_positional_parameters(self):
+        query = Query.update(tables.Passwords, {"account": "a"}).where("id = ?", [3]).build()
+
+        self.assertEqual(query.statement, "UPDATE passwords SET account = ? WHERE id = ?")
+        self.assertEqual(query.parameters, ("a", 3))
+
+    def test_insert_of_row_and_rows(self):
+        row = Query.insert(tables.Passwords, ("account", "user_id"), ("a", 1)).build()
+        rows = Query.insert(tables.Passwords, ("account", "user_id"), [("a", 1), ("b", 1)], ignore=True).build()
+
+        self.assertEqual(row.statement, "INSERT INTO passwords (account, user_id) VALUES (?, ?)")
+        self.assertFalse(row.many)
+        self.assertEqual(rows.statement, "INSERT OR IGNORE INTO passwords (account, user_id) VALUES (?, ?)")
+        self.assertTrue(rows.many)
+
+    def test_returning(self):
+        query = Query.insert("passwords", ("account",), ("a",)).returning(("id", "account")).build()
+
+        self.assertEqual(query.statement, "INSERT INTO passwords (account) VALUES (?) RETURNING id, account")
+
+    def test_virtual_table_and_trigger(self):
+        table = Query.create_virtual_table("t_fts", "fts5", ("a", "content='t'")).build()
+        trigger = Query.create_trigger("t_ai", "AFTER INSERT", "t", ("SELECT 1", "SELECT 2")).build()
+
+        self.assertEqual(table.statement, "CREATE VIRTUAL TABLE IF NOT EXISTS t_fts USING fts5(a, content='t')")
+        self.assertEqual(trigger.statement,
+                         "CREATE TRIGGER IF NOT EXISTS t_ai AFTER INSERT ON t BEGIN SELECT 1; SELECT 2; END")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from src.libraries.search import IncrementalSearch
+
+
+class IncrementalSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.rows = [{"id": 3, "account": "GitHub"}, {"id": 2, "account": "gitlab"}, {"id": 1, "account": "Mail"}]
+        self.search = IncrementalSearch(self.rows, "account")
+
+    def test_matches_substring_case_insensitively_in_original_order(self):
+        self.assertEqual([row["id"] for row in self.search.search("GIT")], [3, 2])
+        self.assertEqual([row["id"] for row in self.search.search("ai")], [1])
+
+    def test_empty_query_returns_all_rows(self):
+        self.search.search("git")
+        self.assertIs(self.search.search(""), self.rows)
+
+    def test_extended_and_shortened_queries(self):
+        self.assertEqual(len(self.search.search("git")), 2)
+        self.assertEqual([row["id"] for row in self.search.search("gith")], [3])
+        self.assertEqual(len(self.search.search("g")), 2)
+        self.assertEqual(self.search.search("github!"), [])
+
+    def test_reset_picks_up_changed_rows(self):
+        self.search.search("git")
+        self.rows.insert(0, {"id": 4, "account": "Gitea"})
+        self.search.reset()
+        self.assertEqual([row["id"] for row in self.search.search("git")], [4, 3, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import sqlite3
+import threading
+import unittest
+from src.libraries.database import Database as Db
+from src.models.models import Password
+from tests.database_case import FIELDS, accounts, DatabaseTestCase
+
+
+class TransactionTest(DatabaseTestCase):
+    def test_commits_on_exit(self):
+        with Db.transaction():
+            Password.create(FIELDS, (1, "a", b"u", b"p"))
+            Password.create(FIELDS, (1, "b", b"u", b"p"))
+
+        self.assertEqual(accounts(), ["a", "b"])
+
+    def test_rolls_back_on_exception(self):
+        with self.assertRaises(RuntimeError):
+            with Db.transaction():
+                Password.create(FIELDS, (1, "a", b"u", b"p"))
+                raise RuntimeError()
+
+        self.assertEqual(accounts(), [])
+
+    def test_nested_block_rolls_back_only_itself(self):
+        with Db.transaction():
+            Password.create(FIELDS, (1, "outer", b"u", b"p"))
+
+            with self.assertRaises(sqlite3.IntegrityError):
+                with Db.transaction():
+                    Password.create(FIELDS, (1, "inner", b"u", b"p"))
+                    Password.create(FIELDS, (1, None, b"u", b"p"))
+
+            Password.create(FIELDS, (1, "after", b"u", b"p"))
+
+        self.assertEqual(accounts(), ["outer", "after"])
+
+    def test_exception_in_nested_block_can_roll_back_everything(self):
+        with self.assertRaises(RuntimeError):
+            with Db.transaction():
+                Password.create(FIELDS, (1, "outer", b"u", b"p"))
+
+                with Db.transaction():
+                    Password.create(FIELDS, (1, "inner", b"u", b"p"))
+                    raise RuntimeError()
+
+        self.assertEqual(accounts(), [])
+
+    def test_uncommitted_changes_are_invisible_to_other_threads(self):
+        seen = []
+
+        with Db.transaction():
+            Password.create(FIELDS, (1, "a", b"u", b"p"))
+            thread = threading.Thread(target=lambda: seen.extend(accounts()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(seen, [])
+        self.assertEqual(accounts(), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()